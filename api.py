@@ -14,6 +14,8 @@ from web3.types import RPCEndpoint, RPCResponse
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
 
+logger = logging.getLogger(__name__)
+
 # Import our transaction storage utility
 import transaction_storage
 
@@ -118,7 +120,7 @@ try:
     from safe_eth.safe import SafeTx
     from safe_eth.eth import EthereumClient
 except ImportError:
-    logging.warning("Could not import safe-eth-py. Using mock Safe implementation.")
+    logger.warning("Could not import safe-eth-py. Using mock Safe implementation.")
     # Mock classes if import fails
     class SafeTx:
         def __init__(self, *args, **kwargs): pass
@@ -132,7 +134,7 @@ except ImportError:
         async def create(cls, ethereum_client, deployer_account, owners, threshold):
             """Mock Safe creation that returns an awaitable"""
             mock_address = "0xMockSafeAddress"
-            logging.info(f"Creating mock Safe at address {mock_address}")
+            logger.info("Creating mock Safe at address %s", mock_address)
             return cls(mock_address, ethereum_client)
             
         async def build_multisig_tx(self, to, value, data, operation, safe_tx_gas, base_gas, gas_price, 
@@ -148,7 +150,7 @@ except ImportError:
         async def execute_transaction(self, safe_tx, signer):
             """Mock execute_transaction method that returns an awaitable"""
             mock_tx_hash = "0x" + os.urandom(32).hex()
-            logging.info(f"Mock Safe transaction executed with hash: {mock_tx_hash}")
+            logger.info("Mock Safe transaction executed with hash: %s", mock_tx_hash)
             return mock_tx_hash
             
         async def retrieve_nonce(self):
@@ -164,7 +166,7 @@ try:
     from mcp import Client as MCPClient
     from mcp.types import Result, ToolCall, ResourceReadRequest
 except ImportError:
-    logging.warning("Could not import mcp-python-sdk. Using mock MCP implementation.")
+    logger.warning("Could not import mcp-python-sdk. Using mock MCP implementation.")
     # Mock classes if import fails
     class MCPClient:
         def __init__(self, base_url=None): 
@@ -205,7 +207,7 @@ try:
     from mech_client import ConfirmationType
     from mech_client.mech_tool_management import get_tools_for_agents, get_tool_description, get_tool_io_schema
 except ImportError:
-    logging.warning("Could not import mech-client. Using mock Mech implementation.")
+    logger.warning("Could not import mech-client. Using mock Mech implementation.")
     # Mock implementation of Mech classes
     class ConfirmationType:
         ON_CHAIN = "on-chain"
@@ -278,7 +280,7 @@ def get_web3(rpc_url: str = DEFAULT_RPC_URL, chain_id: int = DEFAULT_CHAIN_ID) -
             raise ConnectionError(f"Failed to connect to Web3 provider at {rpc_url}")
         
         _web3_instances[rpc_url] = w3
-        logging.info(f"Web3 connected to {rpc_url}")
+        logger.info("Web3 connected to %s", rpc_url)
     
     return _web3_instances[rpc_url]
 
@@ -288,9 +290,9 @@ def get_account() -> LocalAccount:
         try:
             account: LocalAccount = Account.from_key(ETHEREUM_PRIVATE_KEY)
             _accounts["default"] = account
-            logging.info(f"Account loaded: {account.address}")
+            logger.info("Account loaded: %s", account.address)
         except Exception as e:
-            logging.error(f"Failed to load account from private key: {e}")
+            logger.error("Failed to load account from private key: %s", e)
             raise ValueError("Invalid private key")
     return _accounts["default"]
 
@@ -300,7 +302,7 @@ def get_ethereum_client(rpc_url: str = DEFAULT_RPC_URL, chain_id: int = DEFAULT_
     if key not in _ethereum_clients:
         w3 = get_web3(rpc_url, chain_id)
         _ethereum_clients[key] = EthereumClient(w3)
-        logging.info(f"Ethereum client initialized for RPC: {rpc_url}")
+        logger.info("Ethereum client initialized for RPC: %s", rpc_url)
     return _ethereum_clients[key]
 
 async def get_safe_instance(safe_address: str, 
@@ -308,7 +310,7 @@ async def get_safe_instance(safe_address: str,
                      chain_id: int = DEFAULT_CHAIN_ID) -> Optional[Safe]:
     """Initializes and returns a Safe instance asynchronously."""
     if not safe_address:
-        logging.warning("No Safe address provided. Cannot initialize Safe instance.")
+        logger.warning("No Safe address provided. Cannot initialize Safe instance.")
         return None
     
     key = (safe_address, rpc_url)
@@ -317,9 +319,9 @@ async def get_safe_instance(safe_address: str,
         try:
             # Load an existing Safe (this works with both real implementation and our mock)
             _safe_instances[key] = Safe(safe_address, ethereum_client)
-            logging.info(f"Safe instance loaded for address: {safe_address}")
+            logger.info("Safe instance loaded for address: %s", safe_address)
         except Exception as e:
-            logging.error(f"Failed to initialize Safe instance: {e}")
+            logger.error("Failed to initialize Safe instance: %s", e)
             return None
     return _safe_instances[key]
 
@@ -365,7 +367,7 @@ async def check_safe_address_for_account(account):
             return safe_address
         return None
     except Exception as e:
-        logging.error(f"Error checking safe address: {e}")
+        logger.error("Error checking safe address: %s", e)
         return None
 
 async def onboard_safe_account(owners: Optional[List[str]] = None, 
@@ -376,34 +378,34 @@ async def onboard_safe_account(owners: Optional[List[str]] = None,
     Otherwise, deploy a new Safe with the provided owners and threshold.
     Returns the Safe address.
     """
-    logging.info("Checking Safe configuration...")
+    logger.info("Checking Safe configuration...")
     
     if DEFAULT_SAFE_ADDRESS:
-        logging.info(f"Using pre-configured Safe Address: {DEFAULT_SAFE_ADDRESS}")
+        logger.info("Using pre-configured Safe Address: %s", DEFAULT_SAFE_ADDRESS)
         # Verify the Safe exists
         try:
             ethereum_client = get_ethereum_client()
             safe = Safe(DEFAULT_SAFE_ADDRESS, ethereum_client)
             return DEFAULT_SAFE_ADDRESS
         except Exception as e:
-            logging.warning(f"Pre-configured Safe address {DEFAULT_SAFE_ADDRESS} could not be loaded: {e}")
+            logger.warning("Pre-configured Safe address %s could not be loaded: %s", DEFAULT_SAFE_ADDRESS, e)
     
     # No valid Safe found, check if we should create a new one
     if owners:
-        logging.info(f"Creating new Safe with owners: {owners} and threshold: {threshold}")
+        logger.info("Creating new Safe with owners: %s and threshold: %s", owners, threshold)
         try:
             ethereum_client = get_ethereum_client()
             account = get_account()
             
             # Deploy a new Safe - this should work with both real and mock implementations
             safe = await Safe.create(ethereum_client, account, owners, threshold)
-            logging.info(f"New Safe deployed at: {safe.address}")
+            logger.info("New Safe deployed at: %s", safe.address)
             return safe.address
         except Exception as e:
-            logging.error(f"Failed to deploy new Safe: {e}")
+            logger.error("Failed to deploy new Safe: %s", e)
             raise
             
-    logging.warning("No Safe address configured and no owners provided for new Safe deployment.")
+    logger.warning("No Safe address configured and no owners provided for new Safe deployment.")
     return None
 
 async def list_available_tools() -> List[Dict[str, Any]]:
@@ -411,7 +413,7 @@ async def list_available_tools() -> List[Dict[str, Any]]:
     try:
         # Use mech_client's get_tools_for_agents function
         tools = get_tools_for_agents(chain_config="gnosis")  # Default to Gnosis chain
-        logging.info(f"Fetched {len(tools)} available tools")
+        logger.info("Fetched %s available tools", len(tools))
         
         # Ensure each tool has a description
         for tool in tools:
@@ -420,7 +422,7 @@ async def list_available_tools() -> List[Dict[str, Any]]:
         
         return tools
     except Exception as e:
-        logging.error(f"Error listing tools: {e}")
+        logger.error("Error listing tools: %s", e)
         return []
 
 async def execute_payment(total_cost_xdai: float, 
@@ -442,7 +444,7 @@ async def execute_payment(total_cost_xdai: float,
     # Generate a mock transaction hash
     mock_tx_hash = "0x" + os.urandom(32).hex()
     
-    logging.info(f"Processing payment of {total_cost_xdai} xDAI for tools: {', '.join(selected_tools)}")
+    logger.info("Processing payment of %s xDAI for tools: %s", total_cost_xdai, ', '.join(selected_tools))
     
     # Update transaction state if transaction_id is provided
     if transaction_id:
@@ -458,7 +460,7 @@ async def execute_payment(total_cost_xdai: float,
     
     try:
         if safe_address:
-            logging.info(f"Executing payment via Safe at {safe_address}")
+            logger.info("Executing payment via Safe at %s", safe_address)
             
             # In a real implementation, this would use the safe-eth-py lib to:
             # 1. Get the Safe instance
@@ -485,7 +487,7 @@ async def execute_payment(total_cost_xdai: float,
                     payment_tx_hash=mock_tx_hash
                 )
         else:
-            logging.info(f"Executing payment via EOA {account.address}")
+            logger.info("Executing payment via EOA %s", account.address)
             
             # In a real implementation, this would:
             # 1. Build an Ethereum transaction
@@ -511,11 +513,11 @@ async def execute_payment(total_cost_xdai: float,
                     payment_tx_hash=mock_tx_hash
                 )
         
-        logging.info(f"Payment successful! Transaction hash: {mock_tx_hash}")
+        logger.info("Payment successful! Transaction hash: %s", mock_tx_hash)
         return mock_tx_hash
         
     except Exception as e:
-        logging.error(f"Payment failed: {e}")
+        logger.error("Payment failed: %s", e)
         if transaction_id:
             transaction_storage.update_transaction_state(
                 tx_id=transaction_id,
@@ -549,7 +551,7 @@ async def submit_mech_request(agent_id: int,
             details={"agent_id": agent_id, "tool": tool_name, "prompt": prompt}
         )
     
-    logging.info(f"Submitting request for {tool_name} with prompt: {prompt[:50]}...")
+    logger.info("Submitting request for %s with prompt: %s...", tool_name, prompt[:50])
     
     # Simulate a brief delay to make the state changes visible
     await asyncio.sleep(1.5)
@@ -560,7 +562,7 @@ async def submit_mech_request(agent_id: int,
         # 2. Handle response, confirmations, etc.
         
         # Mock successful request submission
-        logging.info(f"Request submitted. Transaction hash: {mock_tx_hash}")
+        logger.info("Request submitted. Transaction hash: %s", mock_tx_hash)
         
         if transaction_id:
             transaction_storage.update_transaction_state(
@@ -577,7 +579,7 @@ async def submit_mech_request(agent_id: int,
         return mock_tx_hash
         
     except Exception as e:
-        logging.error(f"Request submission failed: {e}")
+        logger.error("Request submission failed: %s", e)
         if transaction_id:
             transaction_storage.update_transaction_state(
                 tx_id=transaction_id,
@@ -625,7 +627,7 @@ async def start_mech_execution(request_tx_hash: str,
             execution_steps=exec_steps
         )
     
-    logging.info(f"Starting execution for request: {request_tx_hash}")
+    logger.info("Starting execution for request: %s", request_tx_hash)
     
     # Simulate a brief delay to make the state changes visible
     await asyncio.sleep(1.5)
@@ -641,7 +643,7 @@ async def start_mech_execution(request_tx_hash: str,
             "operator": mock_operator
         }
         
-        logging.info(f"Execution started. Request ID: {mock_request_id}, Operator: {mock_operator}")
+        logger.info("Execution started. Request ID: %s, Operator: %s", mock_request_id, mock_operator)
         
         if transaction_id:
             # Update transaction with execution info
@@ -653,7 +655,7 @@ async def start_mech_execution(request_tx_hash: str,
         return execution_info
         
     except Exception as e:
-        logging.error(f"Execution start failed: {e}")
+        logger.error("Execution start failed: %s", e)
         if transaction_id:
             transaction_storage.update_transaction_state(
                 tx_id=transaction_id,
@@ -723,7 +725,7 @@ async def get_execution_status_and_result(request_id: str,
                     status="in_progress"
                 )
             except Exception as e:
-                logging.warning(f"Could not update execution steps: {e}")
+                logger.warning("Could not update execution steps: %s", e)
     
     elif call_count == 3:
         status = "Comparing Rates"
@@ -747,7 +749,7 @@ async def get_execution_status_and_result(request_id: str,
                     status="in_progress"
                 )
             except Exception as e:
-                logging.warning(f"Could not update execution steps: {e}")
+                logger.warning("Could not update execution steps: %s", e)
     
     else:
         status = "Completed"
@@ -778,9 +780,9 @@ async def get_execution_status_and_result(request_id: str,
                     details={"final_status": status}
                 )
             except Exception as e:
-                logging.warning(f"Could not update execution status: {e}")
+                logger.warning("Could not update execution status: %s", e)
     
-    logging.info(f"Execution status for request {request_id}: {status}")
+    logger.info("Execution status for request %s: %s", request_id, status)
     
     # Simulate a brief delay to make the state changes visible
     await asyncio.sleep(0.5)
@@ -810,7 +812,7 @@ async def verify_and_process_results(request_id: str,
             details={"request_id": request_id, "operators": operators}
         )
     
-    logging.info(f"Verifying results for request {request_id} from {len(operators)} operators")
+    logger.info("Verifying results for request %s from %s operators", request_id, len(operators))
     
     # Reset the status counter for demo purposes
     if request_id in _status_call_counts:
@@ -871,10 +873,10 @@ async def create_new_transaction(
             selected_tools=selected_tools,
             total_cost=total_cost
         )
-        logging.info(f"Created new transaction with ID: {transaction.id}")
+        logger.info("Created new transaction with ID: %s", transaction.id)
         return transaction.id
     except Exception as e:
-        logging.error(f"Error creating transaction: {e}")
+        logger.error("Error creating transaction: %s", e)
         raise
 
 async def get_transaction_by_id(transaction_id: str):
@@ -1,12 +1,11 @@
 import streamlit as st
 import os
 from src.models.request import Request
-from src.services.mcp_service import MCPService
+from src.services.mcp_service import MCPService, SERVICES_FILE, load_services_file
 from src.components.request_form import RequestForm
 from src.components.execution_status import ExecutionStatus
 import time
 import random
-import json
 
 # Initialize session state
 def init_session_state():
@@ -34,15 +33,10 @@ def init_session_state():
     # Load services data from JSON file if not already in session state
     if not st.session_state.get("services"):
         try:
-            with open('enriched_services_data.json', 'r') as f:
-                data = json.load(f)
-                if isinstance(data, dict) and "services" in data:
-                    st.session_state.services = data["services"]
-                    print(f"Loaded {len(data['services'])} services into session state")
-                elif isinstance(data, list):
-                    st.session_state.services = data
-                    print(f"Loaded {len(data)} services into session state")
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            # Parsed once per process, each session gets its own list
+            st.session_state.services = list(load_services_file(SERVICES_FILE))
+            print(f"Loaded {len(st.session_state.services)} services into session state")
+        except (FileNotFoundError, ValueError) as e:
             print(f"Error loading services data: {str(e)}")
             # Use default services if file not found
             st.session_state.services = []
@@ -5,6 +5,7 @@ import uuid
 from datetime import datetime, timedelta
 import traceback
 import json
+import logging
 import re
 import os
 import sys
@@ -26,14 +27,18 @@ from src.utils.execution_utils import (
     generate_mock_data_for_defillama, 
     format_eth_address
 )
+from src.services.mcp_service import SERVICES_FILE, load_services_file
 from src.utils.data_generators import (
     generate_analytics_result,
     generate_prediction_result, 
     generate_token_result, 
     generate_data_feed_result, 
-    generate_optimization_result
+    generate_optimization_result,
+    generate_results
 )
 
+logger = logging.getLogger(__name__)
+
 class ExecutionStatus:
     """Component that displays the execution status of a service request"""
     
@@ -74,19 +79,14 @@ class ExecutionStatus:
             else:
                 # Try to load from file if not in session state
                 try:
-                    with open('enriched_services_data.json', 'r') as f:
-                        data = json.load(f)
-                        if isinstance(data, dict) and "services" in data:
-                            self.services = data["services"]
-                            # Store in session state for future use
-                            st.session_state.services = self.services
-                        else:
-                            self.services = []
-                except (FileNotFoundError, json.JSONDecodeError) as e:
-                    print(f"Error loading services data: {str(e)}")
+                    self.services = list(load_services_file(SERVICES_FILE))
+                    # Store in session state for future use
+                    st.session_state.services = self.services
+                except (FileNotFoundError, ValueError) as e:
+                    logger.error("Error loading services data: %s", e)
                     self.services = []
         except Exception as e:
-            print(f"Error in load_services_data: {str(e)}")
+            logger.error("Error in load_services_data: %s", e)
             self.services = []
             
         # Create a map of service ID to full service data for quicker lookups
@@ -234,7 +234,7 @@ class ExecutionStatus:
             return result
             
         except Exception as e:
-            print(f"Error generating service execution result: {str(e)}")
+            logger.error("Error generating service execution result: %s", e)
             traceback.print_exc()
             
             # Return a basic error result
@@ -270,7 +270,7 @@ class ExecutionStatus:
                 elif "request_textarea" in st.session_state:
                     request_text = st.session_state.request_textarea
                 
-            print(f"Extracted request text: {request_text}")
+            logger.debug("Extracted request text: %s", request_text)
                 
             # Extract service IDs from the services
             for service in services:
@@ -291,13 +291,13 @@ class ExecutionStatus:
             
         # Make sure we have at least default service IDs if none were provided
         if not service_ids:
-            print("No service IDs found. Using default service IDs.")
+            logger.debug("No service IDs found. Using default service IDs.")
             service_ids = ["1722", "1815", "1966", "1983"]
             
         # If we still don't have a request text, use a default
         if not request_text:
             request_text = "Analyze current DeFi market trends and recommend investment strategies"
-            print(f"Using default request text: {request_text}")
+            logger.debug("Using default request text: %s", request_text)
             
         # Generate pipeline steps using the request text
         pipeline_steps = generate_pipeline_steps(service_ids, request_text)
@@ -307,31 +307,21 @@ class ExecutionStatus:
         
         # Distribute different types of results across the services
         result_types = ["analytics", "prediction", "token", "data_feed", "optimization"]
-        result_type_index = 0
+        jobs = []
         
-        for service_id in service_ids:
+        for result_type_index, service_id in enumerate(service_ids):
             # Get the service name to make the output more specific
             service_name = get_service_name(service_id, service_name_map=self.service_name_map)
             
             # Choose a result type based on service name or cycling through types
             result_type = determine_result_type(service_name, result_types[result_type_index % len(result_types)])
-            result_type_index += 1
-            
-            # Generate result based on result type
-            if result_type == "analytics":
-                result = generate_analytics_result(service_name, request_text)
-            elif result_type == "prediction":
-                result = generate_prediction_result(service_name, request_text)
-            elif result_type == "token":
-                result = generate_token_result(service_name, request_text)
-            elif result_type == "data_feed":
-                result = generate_data_feed_result(service_name, request_text)
-            elif result_type == "optimization":
-                result = generate_optimization_result(service_name, request_text)
-            else:
-                # Fallback to analytics if type is unknown
-                result = generate_analytics_result(service_name, request_text)
-            
+            jobs.append((result_type, service_name))
+        
+        # Generate the results of all services concurrently, unknown types fall
+        # back to analytics
+        results = generate_results(jobs, request_text)
+        
+        for service_id, (result_type, service_name), result in zip(service_ids, jobs, results):
             # Set the result type explicitly
             result["result_type"] = result_type
             
@@ -466,7 +456,7 @@ class ExecutionStatus:
         
         # Display any additional sections in the result
         for key, value in result.items():
-            if key not in ["title", "market_overview", "protocol_analysis", "chart_data", "result_type", "metadata"]:
+            if key not in {"title", "market_overview", "protocol_analysis", "chart_data", "result_type", "metadata"}:
                 st.markdown(f"### {key.replace('_', ' ').title()}")
                 
                 if isinstance(value, dict):
@@ -842,7 +832,7 @@ class ExecutionStatus:
         
         # Identify main sections to create tabs
         for key, value in result.items():
-            if key not in ["title", "result_type", "metadata"] and isinstance(value, (dict, list)) and value:
+            if key not in {"title", "result_type", "metadata"} and isinstance(value, (dict, list)) and value:
                 tabs.append((key, value))
                 tab_titles.append(key.replace("_", " ").title())
         
@@ -879,7 +869,7 @@ class ExecutionStatus:
         else:
             # For simple structures or single sections, render without tabs
             for key, value in result.items():
-                if key not in ["title", "result_type", "metadata"]:
+                if key not in {"title", "result_type", "metadata"}:
                     st.markdown(f"### {key.replace('_', ' ').title()}")
                     
                     if isinstance(value, dict):
@@ -1025,7 +1015,7 @@ class ExecutionStatus:
             
             # Ensure we have a request
             if not request:
-                print("No request found in session state. Creating a default request.")
+                logger.debug("No request found in session state. Creating a default request.")
                 # Create a default request for demo purposes
                 default_request = {
                     "prompt": "Analyze current DeFi market trends and recommend investment strategies",
@@ -1077,7 +1067,7 @@ class ExecutionStatus:
                     
             # If no services were selected, use default ones
             if not service_ids:
-                print("No service IDs found in the request. Using default service IDs.")
+                logger.debug("No service IDs found in the request. Using default service IDs.")
                 service_ids = ["1722", "1815", "1966", "1983"]
                 # Update the request with default services to avoid "No services selected" message
                 if isinstance(local_request, dict):
@@ -1287,7 +1277,7 @@ class ExecutionStatus:
             }
         except Exception as e:
             # Log error and return error status
-            print(f"Error getting execution status: {str(e)}")
+            logger.error("Error getting execution status: %s", e)
             traceback.print_exc()
             
             # Return error status
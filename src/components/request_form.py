@@ -1,6 +1,8 @@
 import streamlit as st
 import json
 import os
+import functools
+import math
 import time
 import random
 import re
@@ -18,6 +20,28 @@ import datetime
 # Load environment variables
 load_dotenv()
 
+
+def _service_price(service: Dict[str, Any]) -> float:
+    """Price of a service, as shown on its card and charged in the total"""
+    return service.get('price', 10.0)
+
+
+@functools.lru_cache(maxsize=256)
+def _complete_reasoning(prompt: str, model: str) -> str:
+    """Ask the model for a service recommendation, reusing the answer for a repeated prompt"""
+    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    response = client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": prompt}
+        ],
+        max_tokens=600,
+        temperature=0.3
+    )
+    return response.choices[0].message.content.strip()
+
+
 class RequestForm:
     """Component for creating and submitting requests"""
     
@@ -27,8 +51,6 @@ class RequestForm:
         self.user_email = user_email
         # Create an instance of MCPService for handling data
         self.mcp_service_instance = MCPService()
-        # Get a reference to the defillama_api instance
-        self.defillama_api = getattr(self.mcp_service_instance, 'defillama_api', None)
         # Initialize OpenAI client with explicit token limits
         self.llm = ChatOpenAI(
             model="gpt-4o",
@@ -70,11 +92,12 @@ class RequestForm:
                 
             # Get DeFi Llama data using first service ID as default (will be overridden by reasoning)
             defillama_results = None
-            if self.defillama_api:
+            # Reading defillama_api creates the client on first use only
+            if self.mcp_service_instance.defillama_api:
                 try:
                     # Use the first service ID if available
                     service_id = available_service_ids[0] if available_service_ids else "default_service"
-                    defillama_results = self.defillama_api.process_query(request_text, service_id)
+                    defillama_results = self.mcp_service_instance.query_defillama(request_text, service_id)
                     # Store in session state for later use
                     st.session_state.defillama_results = defillama_results
                 except Exception as e:
@@ -86,10 +109,10 @@ class RequestForm:
                 defillama_summary = f"\nDeFi Llama Analysis:\n"
                 if "summary" in defillama_results:
                     defillama_summary += f"- {defillama_results['summary']}\n"
-                if "aggregated_data" in defillama_results and defillama_results["aggregated_data"]:
-                    for key, value in defillama_results["aggregated_data"].items():
-                        if key == "top_protocols" and isinstance(value, list) and len(value) > 0:
-                            defillama_summary += f"- Top protocols include: {', '.join([p.get('name', 'unknown') for p in value[:3]])}\n"
+                aggregated_data = defillama_results.get("aggregated_data") or {}
+                top_protocols = aggregated_data.get("top_protocols")
+                if isinstance(top_protocols, list) and top_protocols:
+                    defillama_summary += f"- Top protocols include: {', '.join([p.get('name', 'unknown') for p in top_protocols[:3]])}\n"
             
             # Prompt the AI to recommend 2-3 different services based on the query
             # The prompt specifically instructs the AI to consider different IDs
@@ -115,23 +138,10 @@ class RequestForm:
             Choose services that best match the user's specific request based on their descriptions.
             """
             
-            # Initialize OpenAI client
+            # The prompt covers the request, the services and the DeFi Llama summary,
+            # so identical prompts can share one completion. Failures aren't cached
             try:
-                client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-                
-                # Make API call with new format
-                response = client.chat.completions.create(
-                    model=os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"),
-                    messages=[
-                        {"role": "system", "content": "You are a helpful assistant."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    max_tokens=600,
-                    temperature=0.3
-                )
-                
-                # Extract the response content
-                reasoning_text = response.choices[0].message.content.strip()
+                reasoning_text = _complete_reasoning(prompt, os.getenv("OPENAI_MODEL", "gpt-3.5-turbo"))
             except Exception as e:
                 print(f"Error calling OpenAI API: {str(e)}")
                 # Provide a fallback response recommending all services
@@ -298,7 +308,8 @@ class RequestForm:
         if 'checkboxes' not in st.session_state:
             st.session_state.checkboxes = {}
         
-        # Select services based on IDs
+        # Select services based on IDs, resolving each service's ID once for
+        # both the split and the card
         recommended_services = []
         other_services = []
         
@@ -308,14 +319,10 @@ class RequestForm:
             if not service_id:
                 service_id = f"service-{hash(str(service))}"
                 
-            # Ensure the service has a price
-            if 'price' not in service:
-                service['price'] = float(service.get('cost', 10))
-            
             if service_id in recommended_service_ids:
-                recommended_services.append(service)
+                recommended_services.append((service_id, service))
             else:
-                other_services.append(service)
+                other_services.append((service_id, service))
         
         # Divide the page into sections
         st.markdown("### Recommended Services")
@@ -326,18 +333,18 @@ class RequestForm:
         
         # Display recommended services
         if recommended_services:
-            for service in recommended_services:
-                self._render_service_card(service, selected_services, total_cost)
+            for service_id, service in recommended_services:
+                self._render_service_card(service, selected_services, total_cost, service_id)
         else:
             st.info("No services were specifically recommended based on your request.")
         
         # Display other available services
         st.markdown("### Other Available Services")
-        for service in other_services:
-            self._render_service_card(service, selected_services, total_cost)
+        for service_id, service in other_services:
+            self._render_service_card(service, selected_services, total_cost, service_id)
         
         # Recalculate total cost based on current selections
-        total_cost = sum(service.get('price', 10.0) for service in selected_services)
+        total_cost = math.fsum(map(_service_price, selected_services))
         
         # Display payment summary if services are selected
         if selected_services:
@@ -367,7 +374,7 @@ class RequestForm:
         else:
             st.info("Select at least one service to proceed.")
 
-    def _render_service_card(self, service, selected_services, total_cost):
+    def _render_service_card(self, service, selected_services, total_cost, service_id=None):
         """
         Render a single service card with checkbox.
         
@@ -375,14 +382,16 @@ class RequestForm:
             service: Service dictionary to render
             selected_services: List to append selected services to
             total_cost: Running total cost value (not used, cost is recalculated later)
+            service_id: ID of the service when the caller already resolved it
         """
-        service_id = service.get('id') or service.get('service_id')
-        # Generate a unique ID if service_id is None
-        if not service_id:
-            service_id = f"service-{hash(str(service))}"
+        if service_id is None:
+            service_id = service.get('id') or service.get('service_id')
+            # Generate a unique ID if service_id is None
+            if not service_id:
+                service_id = f"service-{hash(str(service))}"
             
         service_name = service.get('name') or service.get('description', 'Unknown Service')
-        service_price = service.get('price', 10.0)
+        service_price = _service_price(service)
         checkbox_key = f"checkbox_{service_id}"
         
         # Display service card
@@ -420,7 +429,7 @@ class RequestForm:
         """Handle payment confirmation and transition to execution page"""
         try:
             # Calculate total cost from selected services
-            total_cost_value = sum(service.get('price', 10) for service in selected_services)
+            total_cost_value = math.fsum(map(_service_price, selected_services))
             total_cost = f"{total_cost_value:.2f} OLAS"
             
             # Create a dictionary request object with the prompt and selected services
@@ -5,7 +5,7 @@ from typing import List, Optional, Dict, Any
 class Request:
     """Model for handling MCP service requests"""
     prompt: str
-    selected_services: List[dict]
+    selected_services: List[dict] = field(default_factory=list)
     user_email: Optional[str] = None
     total_cost: Optional[str] = None
     request_tx_hash: Optional[str] = None
@@ -18,6 +18,15 @@ class Request:
     transaction_id: Optional[str] = None
     reasoning_steps: Optional[List[str]] = field(default_factory=list)
 
+    def __post_init__(self):
+        """Normalize missing lists so consumers can rely on them"""
+        if self.selected_services is None:
+            self.selected_services = []
+        if self.execution_steps is None:
+            self.execution_steps = []
+        if self.reasoning_steps is None:
+            self.reasoning_steps = []
+
     def to_dict(self) -> dict:
         """Convert request to dictionary"""
         return {
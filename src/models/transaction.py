@@ -0,0 +1,51 @@
+from collections.abc import Mapping
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import List, Optional, Any
+
+@dataclass(slots=True)
+class Transaction:
+    """Model for tracking a mock MCP request execution"""
+    prompt: str
+    created_at: float
+    created_monotonic: float
+    updated_at: float
+    steps: List[str]
+    status: str = "pending"
+    current_step: int = 0
+    service_count: int = 0
+    error: Optional[str] = None
+    result: Optional[dict] = None
+    defillama_data: Optional[dict] = None
+    service_results: List[dict] = field(default_factory=list)
+    timeline_index: int = 0
+    defillama_future: Optional[Future] = None
+    final: bool = False
+    response_bytes: Optional[bytes] = None
+    status_view: Optional['TransactionStatus'] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        # Build the status view once, it reads the live fields on every access
+        self.status_view = TransactionStatus(self)
+
+
+class TransactionStatus(Mapping):
+    """Read-only live view of the execution status of a transaction"""
+    __slots__ = ("_transaction",)
+
+    FIELDS = ("status", "steps", "service_results", "result", "error", "defillama_data")
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init__(self, transaction: Transaction):
+        self._transaction = transaction
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        return getattr(self._transaction, key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS)
@@ -2,7 +2,69 @@ import requests
 import json
 import time
 import random
-from typing import Dict, List, Optional, Union, Any
+import logging
+import itertools
+import threading
+from typing import Dict, List, Optional, Tuple, Union, Any
+from cachetools import LRUCache
+
+# Match all endpoint keywords in one pass when pyahocorasick is installed
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+# Keywords in the query that select each endpoint, in the order endpoints are reported
+_ENDPOINT_KEYWORDS = {
+    "tvl": ("tvl", "total value locked", "value locked", "protocol value"),
+    "prices": ("price", "token price", "current price", "how much is", "worth"),
+    "protocols": ("protocol", "protocols list", "all protocols", "protocols overview"),
+    "chains": ("chain", "chains", "blockchain", "network"),
+    "stablecoins": ("stablecoin", "stable", "pegged", "usdt", "usdc", "dai"),
+    "bridges": ("bridge", "bridging", "cross-chain", "transfer between"),
+    "yields": ("yield", "apy", "interest", "earning", "staking returns"),
+    "dexs": ("dex", "swap", "exchange", "amm", "trading", "trading volume")
+}
+
+
+def _build_endpoint_automaton():
+    """Aho-Corasick automaton mapping every endpoint keyword to its endpoints"""
+    endpoints_by_keyword = {}
+    for endpoint, keywords in _ENDPOINT_KEYWORDS.items():
+        for keyword in keywords:
+            endpoints_by_keyword.setdefault(keyword, []).append(endpoint)
+    automaton = ahocorasick.Automaton()
+    for keyword, endpoints in endpoints_by_keyword.items():
+        automaton.add_word(keyword, tuple(endpoints))
+    automaton.make_automaton()
+    return automaton
+
+
+_ENDPOINT_AUTOMATON = _build_endpoint_automaton() if ahocorasick is not None else None
+
+
+def _match_endpoints(q: str) -> List[str]:
+    """Endpoints whose keywords occur anywhere in the lowercased query"""
+    if _ENDPOINT_AUTOMATON is not None:
+        matched = set()
+        for _, endpoints in _ENDPOINT_AUTOMATON.iter(q):
+            matched.update(endpoints)
+        return [endpoint for endpoint in _ENDPOINT_KEYWORDS if endpoint in matched]
+    # One matching keyword is enough, the rest of an endpoint's keywords are skipped
+    return [
+        endpoint for endpoint, keywords in _ENDPOINT_KEYWORDS.items()
+        if any(keyword in q for keyword in keywords)
+    ]
+
+
+# Inferred parameters shared by all clients, keyed by (lowercased query,
+# protocols version). Versions are unique across clients, so a key always
+# refers to one loaded protocols list
+_PROTOCOLS_VERSIONS = itertools.count(1)
+_INFER_CACHE = LRUCache(maxsize=1024)
+_INFER_CACHE_LOCK = threading.Lock()
 
 class DefiLlamaAPI:
     """
@@ -24,6 +86,8 @@ class DefiLlamaAPI:
         self.protocols_cache_time = 0
         # Cache expiry in seconds (1 hour)
         self.cache_expiry = 3600
+        # Bumped whenever all_protocols changes so cached inferences are invalidated
+        self.protocols_version = 0
         
         # Load protocols on initialization
         self.all_protocols = self.load_all_protocols()
@@ -35,12 +99,12 @@ class DefiLlamaAPI:
         Returns:
             List of protocol dictionaries
         """
-        print("Loading all protocols from DeFi Llama...")
+        logger.debug("Loading all protocols from DeFi Llama...")
         try:
             # Check if we have a valid cache
-            current_time = time.time()
+            current_time = time.monotonic()
             if self.protocols_cache and (current_time - self.protocols_cache_time < self.cache_expiry):
-                print("Using cached protocols data")
+                logger.debug("Using cached protocols data")
                 return self.protocols_cache
             
             # Make the API call
@@ -52,11 +116,13 @@ class DefiLlamaAPI:
             # Update cache
             self.protocols_cache = protocols
             self.protocols_cache_time = current_time
+            self.protocols_version = next(_PROTOCOLS_VERSIONS)
             
-            print(f"Successfully loaded {len(protocols)} protocols")
+            logger.info("Successfully loaded %d protocols", len(protocols))
             return protocols
         except Exception as e:
-            print(f"Error loading protocols: {str(e)}")
+            logger.error("Error loading protocols: %s", e)
+            self.protocols_version = next(_PROTOCOLS_VERSIONS)
             # Return empty list on error
             return []
     
@@ -103,7 +169,7 @@ class DefiLlamaAPI:
             response.raise_for_status()
             return float(response.json())
         except Exception as e:
-            print(f"Error getting TVL for {protocol_slug}: {str(e)}")
+            logger.error("Error getting TVL for %s: %s", protocol_slug, e)
             return 0
     
     def infer_parameters(self, query: str) -> Dict[str, Any]:
@@ -116,6 +182,27 @@ class DefiLlamaAPI:
         Returns:
             Dictionary with inferred parameters
         """
+        key = (query.lower(), self.protocols_version)
+        with _INFER_CACHE_LOCK:
+            cached = _INFER_CACHE.get(key)
+        if cached is None:
+            cached = self._infer_parameters_uncached(*key)
+            with _INFER_CACHE_LOCK:
+                _INFER_CACHE[key] = cached
+        # Hand out fresh lists so callers can't mutate the cached entry
+        return {key: list(value) if isinstance(value, tuple) else value for key, value in cached}
+    
+    def _infer_parameters_uncached(self, q: str, protocols_version: int) -> tuple:
+        """
+        Infer API call parameters from an already lowercased query
+        
+        Args:
+            q: The lowercased query
+            protocols_version: Version of all_protocols, used as part of the cache key
+            
+        Returns:
+            Tuple of (key, value) pairs with list values frozen to tuples
+        """
         # Default parameters
         params = {
             "endpoints": [],
@@ -130,14 +217,14 @@ class DefiLlamaAPI:
             protocol_name = protocol.get("name", "").lower()
             protocol_slug = protocol.get("slug", "").lower()
             
-            if protocol_name in query.lower() or protocol_slug in query.lower():
+            if protocol_name in q or protocol_slug in q:
                 params["protocols"].append(protocol.get("slug", ""))
         
         # If no protocols were identified by exact match, try common protocols
         if not params["protocols"]:
             common_protocols = ["aave", "compound", "uniswap", "curve", "maker", "sushiswap", "balancer"]
             for protocol_name in common_protocols:
-                if protocol_name.lower() in query.lower():
+                if protocol_name.lower() in q:
                     # Find the protocol in our loaded protocols
                     found_protocol = self.find_protocol_by_name(protocol_name)
                     if found_protocol:
@@ -146,7 +233,7 @@ class DefiLlamaAPI:
         # Infer chains
         common_chains = ["ethereum", "bsc", "polygon", "avalanche", "arbitrum", "optimism", "solana"]
         for chain in common_chains:
-            if chain.lower() in query.lower():
+            if chain.lower() in q:
                 params["chains"].append(chain)
         
         # Infer tokens
@@ -158,7 +245,7 @@ class DefiLlamaAPI:
             {"symbol": "DAI", "address": "ethereum:0x6b175474e89094c44da98b954eedeac495271d0f"}
         ]
         for token in common_tokens:
-            if token["symbol"].lower() in query.lower():
+            if token["symbol"].lower() in q:
                 params["tokens"].append(token)
         
         # Infer timeframe
@@ -170,42 +257,27 @@ class DefiLlamaAPI:
         }
         for tf, terms in timeframes.items():
             for term in terms:
-                if term.lower() in query.lower():
+                if term.lower() in q:
                     params["timeframe"] = tf
                     break
         
         # Infer endpoints based on keywords in the query
-        endpoint_keywords = {
-            "tvl": ["tvl", "total value locked", "value locked", "protocol value"],
-            "prices": ["price", "token price", "current price", "how much is", "worth"],
-            "protocols": ["protocol", "protocols list", "all protocols", "protocols overview"],
-            "chains": ["chain", "chains", "blockchain", "network"],
-            "stablecoins": ["stablecoin", "stable", "pegged", "usdt", "usdc", "dai"],
-            "bridges": ["bridge", "bridging", "cross-chain", "transfer between"],
-            "yields": ["yield", "apy", "interest", "earning", "staking returns"],
-            "dexs": ["dex", "swap", "exchange", "amm", "trading", "trading volume"]
-        }
-        
-        for endpoint, keywords in endpoint_keywords.items():
-            for keyword in keywords:
-                if keyword.lower() in query.lower():
-                    if endpoint not in params["endpoints"]:
-                        params["endpoints"].append(endpoint)
+        params["endpoints"] = _match_endpoints(q)
         
         # If no specific endpoints were identified, select default ones based on the query
         if not params["endpoints"]:
             # Default to most relevant endpoints
-            if any(word in query.lower() for word in ["overview", "summary", "market"]):
+            if any(word in q for word in ["overview", "summary", "market"]):
                 params["endpoints"] = ["tvl", "protocols"]
-            elif any(word in query.lower() for word in ["yield", "earn"]):
+            elif any(word in q for word in ["yield", "earn"]):
                 params["endpoints"] = ["yields"]
-            elif any(word in query.lower() for word in ["volume", "trading"]):
+            elif any(word in q for word in ["volume", "trading"]):
                 params["endpoints"] = ["dexs"]
             else:
                 # If still unclear, choose a basic set of endpoints
                 params["endpoints"] = ["tvl", "protocols"]
         
-        return params
+        return tuple((key, tuple(value) if isinstance(value, list) else value) for key, value in params.items())
     
     def get_protocols(self) -> Dict[str, Any]:
         """Get all protocols"""
@@ -407,14 +479,19 @@ class DefiLlamaAPI:
             ]
         }
         
+        # The inferred parameters stay the same for every endpoint below
+        protocols = params["protocols"]
+        chains = params["chains"]
+        tokens = params["tokens"]
+        
         # Add inferred parameters to the results
         step_details = []
-        if params["protocols"]:
-            step_details.append(f"Protocols: {', '.join(params['protocols'])}")
-        if params["chains"]:
-            step_details.append(f"Chains: {', '.join(params['chains'])}")
-        if params["tokens"]:
-            step_details.append(f"Tokens: {', '.join([t['symbol'] for t in params['tokens']])}")
+        if protocols:
+            step_details.append(f"Protocols: {', '.join(protocols)}")
+        if chains:
+            step_details.append(f"Chains: {', '.join(chains)}")
+        if tokens:
+            step_details.append(f"Tokens: {', '.join([t['symbol'] for t in tokens])}")
         if params["endpoints"]:
             step_details.append(f"Endpoints: {', '.join(params['endpoints'])}")
             
@@ -427,10 +504,10 @@ class DefiLlamaAPI:
             
             if endpoint == "tvl":
                 # Get TVL data
-                if params["protocols"] and len(params["protocols"]) == 1:
+                if protocols and len(protocols) == 1:
                     # If a specific protocol is mentioned, get its details
-                    api_result = self.get_protocol_details(params["protocols"][0])
-                    api_call_results.append(f"Retrieved TVL data for {params['protocols'][0]}")
+                    api_result = self.get_protocol_details(protocols[0])
+                    api_call_results.append(f"Retrieved TVL data for {protocols[0]}")
                 else:
                     # Otherwise, get all protocols
                     api_result = self.get_protocols()
@@ -438,9 +515,9 @@ class DefiLlamaAPI:
                 
             elif endpoint == "prices":
                 # Get price data
-                if params["tokens"]:
+                if tokens:
                     # If specific tokens are mentioned, get their prices
-                    token_addresses = [token["address"] for token in params["tokens"]]
+                    token_addresses = [token["address"] for token in tokens]
                     api_result = self.get_current_prices(token_addresses)
                     api_call_results.append(f"Retrieved price data for {len(token_addresses)} tokens")
                 else:
@@ -460,10 +537,10 @@ class DefiLlamaAPI:
             
             elif endpoint == "chains":
                 # Get chain data
-                if params["chains"] and len(params["chains"]) == 1:
+                if chains and len(chains) == 1:
                     # If a specific chain is mentioned, get its TVL
-                    api_result = self.get_chain_tvl(params["chains"][0])
-                    api_call_results.append(f"Retrieved TVL data for {params['chains'][0]} chain")
+                    api_result = self.get_chain_tvl(chains[0])
+                    api_call_results.append(f"Retrieved TVL data for {chains[0]} chain")
                 else:
                     # Otherwise, get all chains
                     api_result = self.get_chains()
@@ -486,10 +563,10 @@ class DefiLlamaAPI:
             
             elif endpoint == "dexs":
                 # Get DEX volume data
-                if params["chains"] and len(params["chains"]) == 1:
+                if chains and len(chains) == 1:
                     # If a specific chain is mentioned, get DEXs for that chain
-                    api_result = self.get_dexs(params["chains"][0])
-                    api_call_results.append(f"Retrieved DEX volume data for {params['chains'][0]} chain")
+                    api_result = self.get_dexs(chains[0])
+                    api_call_results.append(f"Retrieved DEX volume data for {chains[0]} chain")
                 else:
                     # Otherwise, get all DEXs
                     api_result = self.get_dexs()
@@ -500,12 +577,13 @@ class DefiLlamaAPI:
                 results["api_calls"].append(api_result)
         
         # Update API execution step
+        api_step = results["processing_steps"][2]
         if api_call_results:
-            results["processing_steps"][2]["status"] = "complete"
-            results["processing_steps"][2]["detail"] = ", ".join(api_call_results)
+            api_step["status"] = "complete"
+            api_step["detail"] = ", ".join(api_call_results)
         else:
-            results["processing_steps"][2]["status"] = "error"
-            results["processing_steps"][2]["detail"] = "No API calls were executed"
+            api_step["status"] = "error"
+            api_step["detail"] = "No API calls were executed"
         
         # Generate a summary based on the API calls
         if results["api_calls"]:
@@ -521,10 +599,22 @@ class DefiLlamaAPI:
                 aggregated_data = {}
                 aggregation_details = []
                 
+                # Find the first successful call of each kind in a single pass
+                tvl_call = price_call = yield_call = dex_call = None
+                for call in successful_calls:
+                    endpoint = call["endpoint"]
+                    if tvl_call is None and "/protocol" in endpoint:
+                        tvl_call = call
+                    if price_call is None and ("/price" in endpoint or "/chart" in endpoint):
+                        price_call = call
+                    if yield_call is None and "/pools" in endpoint:
+                        yield_call = call
+                    if dex_call is None and "/dexs" in endpoint:
+                        dex_call = call
+                
                 # Extract TVL information if available
-                tvl_calls = [call for call in successful_calls if "/protocol" in call["endpoint"] or "/protocols" in call["endpoint"]]
-                if tvl_calls:
-                    tvl_data = tvl_calls[0]["data"]
+                if tvl_call:
+                    tvl_data = tvl_call["data"]
                     if "protocols" in tvl_data:
                         # Sort protocols by TVL
                         sorted_protocols = sorted(tvl_data["protocols"], key=lambda x: x.get("tvl", 0), reverse=True)
@@ -538,17 +628,15 @@ class DefiLlamaAPI:
                         aggregation_details.append(f"Identified top {len(top_protocols)} protocols by TVL")
                 
                 # Extract price information if available
-                price_calls = [call for call in successful_calls if "/price" in call["endpoint"] or "/chart" in call["endpoint"]]
-                if price_calls:
-                    price_data = price_calls[0]["data"]
+                if price_call:
+                    price_data = price_call["data"]
                     if "coins" in price_data:
                         aggregated_data["token_prices"] = price_data["coins"]
                         aggregation_details.append(f"Aggregated price data for {len(price_data['coins'])} tokens")
                 
                 # Extract yield information if available
-                yield_calls = [call for call in successful_calls if "/pools" in call["endpoint"]]
-                if yield_calls:
-                    yield_data = yield_calls[0]["data"]
+                if yield_call:
+                    yield_data = yield_call["data"]
                     if "data" in yield_data:
                         # Sort pools by APY
                         sorted_pools = sorted(yield_data["data"], key=lambda x: x.get("apy", 0), reverse=True)
@@ -557,9 +645,8 @@ class DefiLlamaAPI:
                         aggregation_details.append(f"Identified top {len(top_pools)} yield pools by APY")
                 
                 # Extract DEX volume information if available
-                dex_calls = [call for call in successful_calls if "/dexs" in call["endpoint"]]
-                if dex_calls:
-                    dex_data = dex_calls[0]["data"]
+                if dex_call:
+                    dex_data = dex_call["data"]
                     if "dexs" in dex_data:
                         # Sort DEXs by volume
                         sorted_dexs = sorted(dex_data["dexs"], key=lambda x: x.get("totalVolume", 0), reverse=True)
@@ -570,12 +657,13 @@ class DefiLlamaAPI:
                 results["aggregated_data"] = aggregated_data
                 
                 # Update data aggregation step
+                aggregation_step = results["processing_steps"][3]
                 if aggregation_details:
-                    results["processing_steps"][3]["status"] = "complete"
-                    results["processing_steps"][3]["detail"] = "; ".join(aggregation_details)
+                    aggregation_step["status"] = "complete"
+                    aggregation_step["detail"] = "; ".join(aggregation_details)
                 else:
-                    results["processing_steps"][3]["status"] = "warning"
-                    results["processing_steps"][3]["detail"] = "No data could be aggregated from API calls"
+                    aggregation_step["status"] = "warning"
+                    aggregation_step["detail"] = "No data could be aggregated from API calls"
                 
                 # Update result generation step
                 results["processing_steps"][4]["status"] = "complete"
@@ -595,6 +683,25 @@ class DefiLlamaAPI:
         
         return results
 
+    def process_queries_batch(self, queries: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Process several queries at once, hitting DeFi Llama only once per distinct query
+        
+        Args:
+            queries: List of (query, service_id) pairs
+            
+        Returns:
+            List of results in the same order as the queries
+        """
+        results = []
+        by_query = {}
+        for query, service_id in queries:
+            if query not in by_query:
+                by_query[query] = self.process_query(query, service_id)
+            # Share the fetched data, only the requesting service differs
+            results.append({**by_query[query], "service_id": service_id})
+        return results
+
 # Example usage:
 # defillama_api = DefiLlamaAPI()
 # results = defillama_api.process_query("What's the TVL of Uniswap?", "1722")
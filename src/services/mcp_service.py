@@ -1,19 +1,367 @@
-import json
 import os
+import re
+import sys
 import time
+import logging
+import hashlib
+import mmap
 import random
-from typing import Dict, Any, List, Union
+import functools
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Sequence, Union
+from cachetools import TTLCache
 from ..models.request import Request
-from .defillama_api import DefiLlamaAPI
+from ..models.transaction import Transaction
+
+# Prefer the fastest available JSON library, falling back to the stdlib
+try:
+    from orjson import loads as _json_loads, dumps as _json_dumps
+    # orjson parses straight from a buffer, so files can be memory-mapped
+    _JSON_PARSES_BUFFERS = True
+except ImportError:
+    import json
+    _JSON_PARSES_BUFFERS = False
+    try:
+        from ujson import loads as _json_loads
+    except ImportError:
+        from json import loads as _json_loads
+    
+    def _json_dumps(obj: Any, default=None) -> bytes:
+        return json.dumps(obj, default=default).encode()
+
+# Optional streaming parser for very large mock data files
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+# Data files live in the project root, resolved once so loading doesn't depend
+# on the working directory
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SERVICES_FILE = os.path.join(_PROJECT_ROOT, "enriched_services_data.json")
+_INFRASTRUCTURE_STATS_FILE = os.path.join(_PROJECT_ROOT, "olas_infrastructure_stats.json")
+
+# Dedicated generator for the mock data, kept apart from the shared module-level one
+_rng = random.Random()
+
+
+def _with_price(service: Mapping[str, Any]) -> Mapping[str, Any]:
+    """A service carrying the price shown in the catalog, derived from its cost"""
+    if "price" in service:
+        return service
+    return {**service, "price": float(service.get("cost", 10))}
+
+
+# Fallback services used when the mock services file is missing, priced and
+# frozen once so instances can share them without copying
+_DEFAULT_SERVICES = tuple(MappingProxyType(_with_price(service)) for service in [
+    {
+        "service_id": "1722",
+        "description": "DeFi Analytics - Provides comprehensive data analysis of DeFi protocols and market trends.",
+        "mech_address": "0xf07fdfed257949e0d9c399fda361edf4f35de166",
+        "owner_address": "0x9e9d9...15565",
+        "status": "Active",
+        "version": "1.2.3",
+        "threshold": "1.5"
+    },
+    {
+        "service_id": "1815",
+        "description": "Token Price Analysis - Specialized in tracking and predicting price movements of crypto tokens.",
+        "mech_address": "0x478ad20ed958dcc5ad4aba6f4e4cc51e07a840e4",
+        "owner_address": "0xDFE16...b84b5",
+        "status": "Active",
+        "version": "1.0.4",
+        "threshold": "1.0"
+    },
+    {
+        "service_id": "1999",
+        "description": "Yield Farming Optimizer - Identifies the highest yield opportunities across different protocols.",
+        "mech_address": "0xa61026515b701c9a123b0587fd601857f368127a",
+        "owner_address": "0x6ddde...45e56",
+        "status": "Active",
+        "version": "2.1.0",
+        "threshold": "1.2"
+    },
+    {
+        "service_id": "2101",
+        "description": "Risk Assessment Tool - Evaluates security risks and vulnerabilities in DeFi protocols.",
+        "mech_address": "0xb87de244f368c4c4f5f0d173973dc0645a78eeae",
+        "owner_address": "0x45fa8...27cde",
+        "status": "Active",
+        "version": "1.1.5",
+        "threshold": "2.0"
+    },
+    {
+        "service_id": "2255",
+        "description": "NFT Market Analysis - Tracks and analyzes trends in NFT marketplaces and collections.",
+        "mech_address": "0xc72ef03f0aac890f02879d98e96ef0622f13ae4b",
+        "owner_address": "0x78ab3...9cd4f",
+        "status": "Active",
+        "version": "1.3.2",
+        "threshold": "1.0"
+    },
+    {
+        "service_id": "2367",
+        "description": "Stablecoin Monitor - Monitors stablecoin pegs and liquidity across different blockchains.",
+        "mech_address": "0xd16e12a23607013a18528dd96e837fff7e836454",
+        "owner_address": "0xa923c...f78e1",
+        "status": "Active",
+        "version": "1.4.0",
+        "threshold": "0.8"
+    },
+    {
+        "service_id": "2488",
+        "description": "Cross-Chain Bridge Analyzer - Analyzes efficiencies and security of cross-chain bridge protocols.",
+        "mech_address": "0xf92d3163ff26f9c297dc05d29fda6a2ed80279bb",
+        "owner_address": "0x39fe4...a12b8",
+        "status": "Active",
+        "version": "0.9.5",
+        "threshold": "1.3"
+    }
+])
+# Services kept when the mock services file exists but cannot be parsed
+_UNPARSEABLE_SERVICES_FALLBACK = _DEFAULT_SERVICES[:1]
+
+# Fallback infrastructure stats used when the stats file is missing, frozen like the services
+_DEFAULT_INFRASTRUCTURE_STATS = MappingProxyType({
+    "ethereum": MappingProxyType({
+        "components": (),
+        "agent_instances": 0,
+        "service_instances": 0
+    }),
+    "gnosis": MappingProxyType({
+        "components": (),
+        "agent_instances": 0,
+        "service_instances": 0
+    })
+})
+
+# Expected timeline of request steps as (seconds elapsed, step), with the step
+# strings interned since every transaction links to them
+_TIMELINE = tuple((threshold, sys.intern(step)) for threshold, step in (
+    (3, "Query Analysis - Understanding request parameters"),
+    (6, "Parameter Inference - Determining optimal service parameters"),
+    (10, "API Execution - Connecting to external data sources"),
+    (15, "Service Processing - Running analysis on retrieved data"),
+    (20, "Data Aggregation - Combining results from different services"),
+    (25, "Result Generation - Preparing final response")
+))
+
+# Expected timeline of each service's execution steps as (seconds since service start, step)
+_SERVICE_TIMELINE = tuple((threshold, sys.intern(step)) for threshold, step in (
+    (1, "Initializing service"),
+    (3, "Loading data sources"),
+    (6, "Processing request"),
+    (10, "Analyzing results"),
+    (15, "Preparing response")
+))
+# Steps listed for a service once it has completed
+_SERVICE_FINAL_STEPS = tuple(step for _, step in _SERVICE_TIMELINE) + (sys.intern("Finalizing"),)
+
+# Choices drawn from for the mock aggregated result and recommendations
+_SENTIMENTS = ("bullish", "neutral", "bearish")
+_RECOMMENDED_PROTOCOLS = ("Uniswap V3", "Aave", "Compound", "Curve")
+_MONITORED_METRICS = ("price fluctuations", "APY changes", "TVL shifts")
+_PRICE_TOKENS = ("ETH", "OLAS", "UNI", "AAVE", "CRV", "MKR")
+_YIELD_PROTOCOLS = ("Curve", "Convex", "Yearn", "Compound", "Aave")
+_YIELD_PAIRS = ("ETH-USDC", "BTC-ETH", "OLAS-ETH")
+_GENERIC_FACTORS = ("liquidity depth", "price volatility", "protocol adoption", "gas costs", "market sentiment")
+
+
+# Timeline templates for DeFi Llama processing steps, looked up by step name and
+# falling back to an in-order substring match
+_STEP_TEMPLATES = {
+    "Query Analysis": "Query Analysis - {}",
+    "Parameter Inference": "Parameter Inference - {}",
+    "API Execution": "API Execution - {}",
+    "API": "API Execution - {}",
+    "Data Aggregation": "Data Aggregation - {}",
+    "Aggregating": "Data Aggregation - {}"
+}
+# Substring fallback as one regex, the alternatives are tried in table order
+# so earlier keys keep their priority
+_STEP_PATTERN = re.compile("|".join(f".*?({re.escape(key)})" for key in _STEP_TEMPLATES), re.DOTALL)
+
+# Services files larger than this are streamed with ijson when it is installed
+_STREAMING_THRESHOLD = 10 * 1024 * 1024
+
+# Mock transactions kept at most, least recently used ones are evicted first,
+# and seconds after submission before a transaction expires
+_MAX_TRANSACTIONS = 10_000
+_TRANSACTION_TTL = 3600
+
+# Cache of DeFi Llama results keyed by (prompt, service_id), shared by all
+# MCPService instances so the request form and submissions reuse each other's
+# results, and its expiry in seconds (5 minutes)
+_DEFILLAMA_CACHE = OrderedDict()
+_DEFILLAMA_CACHE_SIZE = 256
+_DEFILLAMA_CACHE_EXPIRY = 300
+_DEFILLAMA_CACHE_LOCK = threading.Lock()
+
+# Worker threads for DeFi Llama queries so submit_request doesn't block, shared
+# by all MCPService instances since the app builds new ones on every rerun
+_DEFILLAMA_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="defillama")
+
+
+def _parse_json_file(f) -> Any:
+    """Parse an open binary JSON file, without an intermediate copy when possible"""
+    if _JSON_PARSES_BUFFERS:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return _json_loads(view)
+    return _json_loads(f.read())
+
+
+def read_services_file(path: str) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    """Parse a services file, streaming it when it is very large"""
+    with open(path, 'rb') as f:
+        if ijson is not None and os.path.getsize(path) > _STREAMING_THRESHOLD:
+            # Stream the services one at a time instead of building the whole document
+            first_char = f.read(64).lstrip()[:1]
+            f.seek(0)
+            prefix = 'item' if first_char == b'[' else 'services.item'
+            try:
+                return {"services": list(ijson.items(f, prefix, use_float=True))}
+            except ijson.JSONError as e:
+                # Report malformed files like the other parsers do
+                raise ValueError(str(e)) from e
+        return _parse_json_file(f)
+
+
+# Keywords that classify a prompt, found anywhere in it (so "yields" counts too)
+# with a single scan
+_YIELD_KEYWORDS = frozenset({"apy", "yield"})
+_PRICE_KEYWORDS = frozenset({"price", "value"})
+_RISK_KEYWORDS = frozenset({"risk"})
+_PROMPT_KEYWORDS = re.compile("|".join(sorted(_YIELD_KEYWORDS | _PRICE_KEYWORDS | _RISK_KEYWORDS)))
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify_prompt(prompt: str) -> str:
+    """Classify a prompt as a "yield", "price", "risk" or "generic" request"""
+    keywords = frozenset(_PROMPT_KEYWORDS.findall(prompt.lower()))
+    if keywords & _YIELD_KEYWORDS:
+        return "yield"
+    if keywords & _PRICE_KEYWORDS:
+        return "price"
+    if keywords & _RISK_KEYWORDS:
+        return "risk"
+    return "generic"
+
+
+
+def _defi_analytics_output(category: str) -> str:
+    """Mock output of the DeFi Analytics service"""
+    if category == "yield":
+        return f"Analysis of APY rates across major DeFi protocols shows an average of {_rng.uniform(4.5, 15.2):.2f}% APY in the last 30 days. Uniswap V3 liquidity pools for stablecoins have shown consistent returns of {_rng.uniform(3.0, 8.0):.2f}% APY."
+    return f"DeFi TVL analysis shows ${_rng.randint(40, 100)}B locked across all protocols, with a {_rng.uniform(-5.0, 10.0):.1f}% change in the last week. Top 3 protocols by TVL are currently MakerDAO, Aave, and Curve."
+
+
+def _token_price_output(category: str) -> str:
+    """Mock output of the Token Price Analysis service"""
+    token = _rng.choice(_PRICE_TOKENS)
+    return f"Price analysis for {token} indicates a {_rng.uniform(-15.0, 25.0):.1f}% change over the past 7 days with volatility at {_rng.uniform(20.0, 80.0):.1f}%. Technical indicators suggest a {_rng.choice(_SENTIMENTS)} trend in the short term."
+
+
+def _yield_optimizer_output(category: str) -> str:
+    """Mock output of the Yield Farming Optimizer service"""
+    return f"Current highest yield opportunities: {_rng.choice(_YIELD_PROTOCOLS)} {_rng.uniform(5.0, 25.0):.2f}% APY for stablecoins, {_rng.choice(_YIELD_PROTOCOLS)} {_rng.uniform(10.0, 50.0):.2f}% APY for {_rng.choice(_YIELD_PAIRS)} pairs."
+
+
+def _generic_output(category: str) -> str:
+    """Mock output for services without a dedicated handler"""
+    return f"Analysis complete. Found {_rng.randint(3, 15)} relevant data points with {_rng.uniform(80.0, 98.0):.1f}% confidence. The most significant factor identified was {_rng.choice(_GENERIC_FACTORS)}."
+
+
+# Mock output generators keyed by service ID, anything else gets _generic_output.
+# They take the category of the prompt, classified once by the caller
+_SERVICE_OUTPUT_HANDLERS = {
+    "1722": _defi_analytics_output,  # DeFi Analytics
+    "1815": _token_price_output,  # Token Price Analysis
+    "1999": _yield_optimizer_output,  # Yield Farming Optimizer
+}
+
+
+def _file_version(path: str) -> Optional[int]:
+    """Modification time of a file in nanoseconds, or None if it does not exist"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def load_services_file(path: str) -> tuple:
+    """Services listed in a services file, parsing it again only once it has changed"""
+    return _load_services_file_version(path, _file_version(path))
+
+
+@functools.lru_cache(maxsize=16)
+def _load_services_file_version(path: str, mtime_ns: Optional[int]) -> tuple:
+    """Services of one version of a services file, errors are raised and not cached"""
+    data = read_services_file(path)
+    if isinstance(data, dict) and "services" in data:
+        return tuple(data["services"])
+    if isinstance(data, list):
+        return tuple(data)
+    return ()
+
+
+def _load_mock_services(path: str) -> tuple:
+    """Load the mock services, parsing the file again only once it has changed"""
+    return _load_mock_services_version(path, _file_version(path))
+
+
+@functools.lru_cache(maxsize=16)
+def _load_mock_services_version(path: str, mtime_ns: Optional[int]) -> tuple:
+    """Load one version of the mock services, falling back to the defaults"""
+    try:
+        services = _load_services_file_version(path, mtime_ns)
+    except FileNotFoundError:
+        logger.warning("Mock services data file not found. Using default services list.")
+        services = _DEFAULT_SERVICES
+    except ValueError:
+        # Decode errors of orjson, ujson and json all subclass ValueError
+        logger.warning("Error parsing services JSON file. Using default services list.")
+        services = _UNPARSEABLE_SERVICES_FALLBACK
+    else:
+        logger.info("Loaded %d mock services", len(services))
+    # Price the catalog once per version instead of on every render
+    return tuple(_with_price(service) for service in services)
+
+
+def _load_mock_infrastructure_stats(path: str) -> Dict[str, Any]:
+    """Load the mock infrastructure stats, parsing the file again only once it has changed"""
+    return _load_mock_infrastructure_stats_version(path, _file_version(path))
+
+
+@functools.lru_cache(maxsize=16)
+def _load_mock_infrastructure_stats_version(path: str, mtime_ns: Optional[int]) -> Dict[str, Any]:
+    """Load one version of the mock infrastructure stats, falling back to the defaults"""
+    try:
+        with open(path, 'rb') as f:
+            stats = _parse_json_file(f)
+    except FileNotFoundError:
+        logger.warning("Mock infrastructure stats file not found. Using default stats.")
+        return _DEFAULT_INFRASTRUCTURE_STATS
+    logger.info("Loaded mock infrastructure stats")
+    return stats
+
 
 class MCPService:
     """Service class for interacting with the Olas MCP"""
     
     def __init__(self, server_profile="mock"):
         self.server_profile = server_profile
-        self.transactions = {}
-        self.services = []
-        self.infrastructure_stats = {}
+        # Bounded so finished transactions don't accumulate for the process lifetime
+        self.transactions = TTLCache(maxsize=_MAX_TRANSACTIONS, ttl=_TRANSACTION_TTL, timer=time.monotonic)
+        # JSON encoding of self.services, built on first request
+        self._services_blob = None
+        self._executor = _DEFILLAMA_EXECUTOR
         
         # Initialize default values
         self.base_url = "http://localhost:5000"
@@ -23,129 +371,48 @@ class MCPService:
         if isinstance(server_profile, str) and server_profile.startswith("http"):
             self.base_url = server_profile
             self.server_profile = "remote"
-            print(f"Using remote server at {self.base_url}")
-        
-        # Load mock data if using mock profile
-        if self.server_profile == "mock":
-            self.load_mock_services()
-            self.load_mock_infrastructure_stats()
-            self.defillama_api = DefiLlamaAPI()
+            logger.info("Using remote server at %s", self.base_url)
+    
+    @functools.cached_property
+    def defillama_api(self):
+        """DeFi Llama client for the mock profile, created on first use"""
+        if self.server_profile != "mock":
+            return None
+        from .defillama_api import DefiLlamaAPI
+        return DefiLlamaAPI()
+    
+    @functools.cached_property
+    def services(self) -> List[Dict[str, Any]]:
+        """Services of the mock profile, loaded on first use"""
+        if self.server_profile != "mock":
+            return []
+        # Only the list is private to the instance, the service mappings are
+        # shared with the cache and must not be mutated
+        return list(_load_mock_services(SERVICES_FILE))
+    
+    @functools.cached_property
+    def _services_by_id(self) -> Dict[str, Dict[str, Any]]:
+        """Loaded services keyed by service ID"""
+        return {s["service_id"]: s for s in self.services if "service_id" in s}
+    
+    @functools.cached_property
+    def infrastructure_stats(self) -> Dict[str, Any]:
+        """Infrastructure stats of the mock profile, loaded on first use"""
+        if self.server_profile != "mock":
+            return {}
+        return _load_mock_infrastructure_stats(_INFRASTRUCTURE_STATS_FILE)
     
     def load_mock_services(self):
         """Load mock services data from JSON file"""
-        try:
-            with open('enriched_services_data.json', 'r') as f:
-                data = json.load(f)
-                if isinstance(data, dict) and "services" in data:
-                    self.services = data["services"]
-                elif isinstance(data, list):
-                    self.services = data
-                else:
-                    self.services = []
-                print(f"Loaded {len(self.services)} mock services")
-        except FileNotFoundError:
-            print("Mock services data file not found. Using default services list.")
-            # Enhanced mock services with variety for different query types
-            self.services = [
-                {
-                    "service_id": "1722",
-                    "description": "DeFi Analytics - Provides comprehensive data analysis of DeFi protocols and market trends.",
-                    "mech_address": "0xf07fdfed257949e0d9c399fda361edf4f35de166",
-                    "owner_address": "0x9e9d9...15565",
-                    "status": "Active",
-                    "version": "1.2.3",
-                    "threshold": "1.5"
-                },
-                {
-                    "service_id": "1815",
-                    "description": "Token Price Analysis - Specialized in tracking and predicting price movements of crypto tokens.",
-                    "mech_address": "0x478ad20ed958dcc5ad4aba6f4e4cc51e07a840e4",
-                    "owner_address": "0xDFE16...b84b5",
-                    "status": "Active",
-                    "version": "1.0.4",
-                    "threshold": "1.0"
-                },
-                {
-                    "service_id": "1999",
-                    "description": "Yield Farming Optimizer - Identifies the highest yield opportunities across different protocols.",
-                    "mech_address": "0xa61026515b701c9a123b0587fd601857f368127a",
-                    "owner_address": "0x6ddde...45e56",
-                    "status": "Active",
-                    "version": "2.1.0",
-                    "threshold": "1.2"
-                },
-                {
-                    "service_id": "2101",
-                    "description": "Risk Assessment Tool - Evaluates security risks and vulnerabilities in DeFi protocols.",
-                    "mech_address": "0xb87de244f368c4c4f5f0d173973dc0645a78eeae",
-                    "owner_address": "0x45fa8...27cde",
-                    "status": "Active",
-                    "version": "1.1.5",
-                    "threshold": "2.0"
-                },
-                {
-                    "service_id": "2255",
-                    "description": "NFT Market Analysis - Tracks and analyzes trends in NFT marketplaces and collections.",
-                    "mech_address": "0xc72ef03f0aac890f02879d98e96ef0622f13ae4b",
-                    "owner_address": "0x78ab3...9cd4f",
-                    "status": "Active",
-                    "version": "1.3.2",
-                    "threshold": "1.0"
-                },
-                {
-                    "service_id": "2367",
-                    "description": "Stablecoin Monitor - Monitors stablecoin pegs and liquidity across different blockchains.",
-                    "mech_address": "0xd16e12a23607013a18528dd96e837fff7e836454",
-                    "owner_address": "0xa923c...f78e1",
-                    "status": "Active",
-                    "version": "1.4.0",
-                    "threshold": "0.8"
-                },
-                {
-                    "service_id": "2488",
-                    "description": "Cross-Chain Bridge Analyzer - Analyzes efficiencies and security of cross-chain bridge protocols.",
-                    "mech_address": "0xf92d3163ff26f9c297dc05d29fda6a2ed80279bb",
-                    "owner_address": "0x39fe4...a12b8",
-                    "status": "Active",
-                    "version": "0.9.5",
-                    "threshold": "1.3"
-                }
-            ]
-        except json.JSONDecodeError:
-            print("Error parsing services JSON file. Using default services list.")
-            self.services = [
-                {
-                    "service_id": "1722",
-                    "description": "DeFi Analytics - Provides comprehensive data analysis of DeFi protocols and market trends.",
-                    "mech_address": "0xf07fdfed257949e0d9c399fda361edf4f35de166",
-                    "owner_address": "0x9e9d9...15565",
-                    "status": "Active",
-                    "version": "1.2.3",
-                    "threshold": "1.5"
-                }
-            ]
+        # Only the list is private to the instance, the service mappings are
+        # shared with the cache and must not be mutated
+        self.services = list(_load_mock_services(SERVICES_FILE))
+        self._services_by_id = {s["service_id"]: s for s in self.services if "service_id" in s}
+        self._services_blob = None
     
     def load_mock_infrastructure_stats(self):
         """Load mock infrastructure stats from JSON file"""
-        try:
-            with open('olas_infrastructure_stats.json', 'r') as f:
-                self.infrastructure_stats = json.load(f)
-                print("Loaded mock infrastructure stats")
-        except FileNotFoundError:
-            print("Mock infrastructure stats file not found. Using default stats.")
-            # Default mock data for infrastructure stats
-            self.infrastructure_stats = {
-                "ethereum": {
-                    "components": [],
-                    "agent_instances": 0,
-                    "service_instances": 0
-                },
-                "gnosis": {
-                    "components": [],
-                    "agent_instances": 0,
-                    "service_instances": 0
-                }
-            }
+        self.infrastructure_stats = _load_mock_infrastructure_stats(_INFRASTRUCTURE_STATS_FILE)
     
     def get_available_services(self) -> List[Dict[str, Any]]:
         """Get list of available services from the MCP"""
@@ -155,6 +422,16 @@ class MCPService:
             # In a real implementation, this would call the actual MCP API
             pass
     
+    def get_available_services_bytes(self) -> bytes:
+        """Get list of available services encoded as JSON, encoding it only once"""
+        if self._services_blob is None:
+            self._services_blob = _json_dumps(self.get_available_services())
+        return self._services_blob
+    
+    def get_service(self, service_id: str) -> Optional[Dict[str, Any]]:
+        """Get a loaded service by its ID, or None if it is unknown"""
+        return self._services_by_id.get(service_id)
+    
     def get_infrastructure_stats(self) -> Dict[str, Any]:
         """Get statistics about the Olas infrastructure"""
         if self.server_profile == "mock":
@@ -163,199 +440,277 @@ class MCPService:
             # In a real implementation, this would call the actual MCP API
             pass
     
+    def query_defillama(self, prompt: str, service_id: str) -> Dict[str, Any]:
+        """
+        Process a DeFi Llama query, reusing recent results for identical requests
+        
+        Args:
+            prompt: The user's query
+            service_id: The ID of the service making the request
+            
+        Returns:
+            Dictionary with the DeFi Llama results
+        """
+        return self.query_defillama_batch(prompt, (service_id,))[0]
+    
+    def query_defillama_batch(self, prompt: str, service_ids: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Process a DeFi Llama query for several services in one batch, reusing
+        recent results per service
+        
+        Args:
+            prompt: The user's query
+            service_ids: The IDs of the services making the request
+            
+        Returns:
+            List of result dictionaries, one per service ID
+        """
+        # Key on a fixed-size digest rather than holding on to every prompt string
+        keys = [hashlib.blake2b(f"{service_id}|{prompt}".encode(), digest_size=16).digest() for service_id in service_ids]
+        results = [None] * len(keys)
+        current_time = time.monotonic()
+        with _DEFILLAMA_CACHE_LOCK:
+            for i, key in enumerate(keys):
+                cached = _DEFILLAMA_CACHE.get(key)
+                if cached and (current_time - cached[0] < _DEFILLAMA_CACHE_EXPIRY):
+                    _DEFILLAMA_CACHE.move_to_end(key)
+                    results[i] = cached[1]
+        
+        missing = [i for i, result in enumerate(results) if result is None]
+        if len(missing) < len(keys):
+            logger.debug("Using cached DeFi Llama results for %d of %d services", len(keys) - len(missing), len(keys))
+        if missing:
+            fetched = self.defillama_api.process_queries_batch([(prompt, service_ids[i]) for i in missing])
+            with _DEFILLAMA_CACHE_LOCK:
+                for i, result in zip(missing, fetched):
+                    results[i] = result
+                    _DEFILLAMA_CACHE[keys[i]] = (current_time, result)
+                    _DEFILLAMA_CACHE.move_to_end(keys[i])
+                while len(_DEFILLAMA_CACHE) > _DEFILLAMA_CACHE_SIZE:
+                    _DEFILLAMA_CACHE.popitem(last=False)
+        return results
+    
+    def _build_service_results(self, selected_services: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create the initial per-service results once, when the request is submitted"""
+        service_results = []
+        for idx, service in enumerate(selected_services):
+            if not isinstance(service, Mapping):
+                # Report a malformed selection as a failed service instead of
+                # failing the whole submission
+                logger.warning("Ignoring invalid service selection at index %d: %r", idx, service)
+                service_results.append({
+                    "service_id": f"unknown-{idx}",
+                    "name": f"Service unknown-{idx}",
+                    "status": "failed",
+                    "progress": 0,
+                    "start_time": None,
+                    "execution_steps": [],
+                    "result": None,
+                    "error": "Invalid service selection"
+                })
+                continue
+            service_id = service.get("service_id", f"unknown-{idx}")
+            description = service.get("description")
+            if description is None:
+                # Fall back to the catalog entry when the selection only carries the ID
+                known = self._services_by_id.get(service_id)
+                description = known.get("description") if known else None
+            service_results.append({
+                "service_id": service_id,
+                # Service names repeat across transactions, so share one string per name
+                "name": sys.intern((description or f"Service {service_id}").split(" - ")[0]),
+                "status": "pending",
+                "progress": 0,
+                "start_time": None,
+                "execution_steps": [],
+                "result": None,
+                "error": None
+            })
+        return service_results
+    
     def submit_request(self, request: Request) -> str:
         """Submit a request to the MCP"""
+        # Take the clock readings once for the whole submission
+        now = time.time()
         if self.server_profile == "mock":
-            try:
-                # Simulate request submission
-                transaction_id = request.transaction_id or f"tx_{random.randint(1000, 9999)}_{int(time.time())}"
-                print(f"Creating transaction with ID: {transaction_id}")
-                
-                # Ensure selected_services is properly initialized
-                if not hasattr(request, 'selected_services') or request.selected_services is None:
-                    request.selected_services = []
-                    print("Warning: selected_services was None, initialized to empty list")
-                
-                # Generate mock execution steps based on selected services
-                service_count = len(request.selected_services) if request.selected_services else 0
-                print(f"Request has {service_count} selected services")
-                
-                # Create initial steps
-                initial_steps = ["Request received", "Validating request parameters"]
-                
-                # Create a mock transaction record
-                self.transactions[transaction_id] = {
-                    "request": request.to_dict(),
-                    "status": "pending",
-                    "created_at": time.time(),
-                    "updated_at": time.time(),
-                    "steps": initial_steps,
-                    "current_step": 0,
-                    "service_count": service_count,
-                    "error": None,
-                    "result": None,
-                    "defillama_data": None
-                }
-                print(f"Created transaction record for {transaction_id}")
+            # Simulate request submission
+            transaction_id = request.transaction_id or f"tx_{os.urandom(6).hex()}"
+            logger.debug("Creating transaction with ID: %s", transaction_id)
+            
+            # Request normalizes a missing selected_services to an empty list
+            selected_services = request.selected_services
+            
+            # Generate mock execution steps based on selected services
+            service_count = len(selected_services)
+            logger.debug("Request has %d selected services", service_count)
+            
+            # Create initial steps
+            initial_steps = ["Request received", "Validating request parameters"]
+            
+            # Create a mock transaction record
+            transaction = Transaction(
+                # Polls only read the prompt back, so keep just that rather than
+                # holding on to the whole request
+                prompt=request.prompt,
+                created_at=now,
+                created_monotonic=time.monotonic(),
+                updated_at=now,
+                steps=initial_steps,
+                service_count=service_count,
+                service_results=self._build_service_results(selected_services)
+            )
+            self.transactions[transaction_id] = transaction
+            logger.debug("Created transaction record for %s", transaction_id)
+            
+            # If there are selected services, prepare for DeFi Llama API calls
+            if service_count > 0 and request.prompt:
+                # Query DeFi Llama once for all selected services, which also warms
+                # the cache for later per-service queries of the same prompt
+                # Use default for services without a valid service ID
+                service_ids = tuple(
+                    str(service['service_id']) if isinstance(service, Mapping) and service.get('service_id') else "default_service"
+                    for service in selected_services
+                )
                 
-                # If there are selected services, prepare for DeFi Llama API calls
-                if service_count > 0 and request.prompt:
-                    # Process the request with DefiLlamaAPI in the background
-                    try:
-                        # Get service ID from first service if available
-                        service_id = None
-                        if request.selected_services and len(request.selected_services) > 0:
-                            first_service = request.selected_services[0]
-                            if isinstance(first_service, dict) and 'service_id' in first_service:
-                                service_id = first_service['service_id']
-                        
-                        # Use default if no valid service ID found
-                        if not service_id:
-                            service_id = "default_service"
-                            
-                        print(f"Processing DeFi Llama query for service ID: {service_id}")
-                        
-                        # Get data from DeFi Llama
-                        defillama_results = self.defillama_api.process_query(request.prompt, service_id)
-                        
-                        # Store the results in the transaction
-                        self.transactions[transaction_id]["defillama_data"] = defillama_results
-                        
-                        # If defillama_results contains processing_steps, pre-populate steps
-                        # to accelerate the visualization
-                        if "processing_steps" in defillama_results:
-                            # Keep the initial steps
-                            pre_steps = initial_steps.copy()
-                            
-                            # Append properly formatted processing steps for the timeline
-                            for step in defillama_results["processing_steps"]:
-                                step_name = step.get("step", "")
-                                step_detail = step.get("detail", "")
-                                step_status = step.get("status", "")
-                                
-                                # Format step for display in the processing pipeline
-                                if "Query Analysis" in step_name:
-                                    pre_steps.append(f"Query Analysis - {step_detail}")
-                                elif "Parameter Inference" in step_name:
-                                    pre_steps.append(f"Parameter Inference - {step_detail}")
-                                elif "API" in step_name:
-                                    pre_steps.append(f"API Execution - {step_detail}")
-                                elif "Data Aggregation" in step_name or "Aggregating" in step_name:
-                                    pre_steps.append(f"Data Aggregation - {step_detail}")
-                            
-                            # Update transaction steps if we have pre-populated steps
-                            if len(pre_steps) > len(initial_steps):
-                                self.transactions[transaction_id]["steps"] = pre_steps
-                        
-                        print("DeFi Llama query processed successfully")
-                    except Exception as e:
-                        print(f"Error processing DeFi Llama query: {str(e)}")
+                logger.debug("Submitting DeFi Llama query for services: %s", service_ids)
                 
-                # Return just the transaction ID string, not a dictionary
-                print(f"Returning transaction ID: {transaction_id}")
-                return transaction_id
-            except Exception as e:
-                print(f"Exception in submit_request: {str(e)}")
-                # Return a fallback transaction ID in case of error
-                fallback_id = f"error_tx_{int(time.time())}"
-                return fallback_id
+                # Fetch data from DeFi Llama in the background; get_execution_status
+                # picks up the results once the future completes
+                try:
+                    future = self._executor.submit(self.query_defillama_batch, request.prompt, service_ids)
+                except RuntimeError as e:
+                    # The executor refuses new work once it has been shut down
+                    logger.error("Error submitting DeFi Llama query: %s", e)
+                else:
+                    transaction.defillama_future = future
+            
+            # Return just the transaction ID string, not a dictionary
+            logger.debug("Returning transaction ID: %s", transaction_id)
+            return transaction_id
         else:
             # In a real implementation, this would call the actual MCP API
-            print(f"Non-mock server profile: {self.server_profile}")
+            logger.debug("Non-mock server profile: %s", self.server_profile)
             # Return a mock transaction ID for now
-            return f"remote_tx_{int(time.time())}"
+            return f"remote_tx_{int(now)}"
     
-    def get_execution_status(self, transaction_id: str) -> Dict[str, Any]:
+    def _store_defillama_results(self, transaction: Transaction, future: Future):
+        """Move completed DeFi Llama results from the future into the transaction"""
+        try:
+            batch_results = future.result()
+        except Exception as e:
+            logger.error("Error processing DeFi Llama query: %s", e)
+            return
+        
+        # Store the first service's results in the transaction, the status only
+        # reports those and the rest are kept in the shared cache
+        defillama_results = batch_results[0]
+        transaction.defillama_data = defillama_results
+        
+        # If defillama_results contains processing_steps, add them to the steps
+        # to accelerate the visualization
+        if "processing_steps" in defillama_results:
+            # Insert into the transaction's own list, usually only the initial
+            # request steps are there yet and this amounts to appending
+            steps = transaction.steps
+            insert_at = 2
+            
+            # Format processing steps for the timeline
+            for step in defillama_results["processing_steps"]:
+                step_name = step.get("step", "")
+                step_detail = step.get("detail", "")
+                
+                # Format step for display in the processing pipeline
+                template = _STEP_TEMPLATES.get(step_name)
+                if template is None:
+                    match = _STEP_PATTERN.match(step_name)
+                    if match:
+                        template = _STEP_TEMPLATES[match.group(match.lastindex)]
+                if template is not None:
+                    # Place them right after the initial request steps
+                    steps.insert(insert_at, template.format(step_detail))
+                    insert_at += 1
+        
+        logger.debug("DeFi Llama query processed successfully")
+    
+    def get_execution_status(self, transaction_id: str) -> Mapping[str, Any]:
         """Get status of a request execution"""
         if self.server_profile == "mock":
             # Get the transaction record
             transaction = self.transactions.get(transaction_id)
-            if not transaction:
-                print(f"Warning: Transaction {transaction_id} not found.")
+            
+            # Finished transactions no longer change, return the response built
+            # last time before doing any other work
+            if transaction is not None and transaction.final:
+                return transaction.status_view
+            
+            # Take the clock readings once per poll
+            now = time.time()
+            now_monotonic = time.monotonic()
+            
+            if transaction is None:
+                logger.warning("Transaction %s not found.", transaction_id)
                 # If transaction not found, create a mock one with minimal data
-                transaction = {
-                    "status": "pending",
-                    "steps": ["Request received"],
-                    "current_step": 0,
-                    "error": None,
-                    "result": None,
-                    "service_count": 0,
-                    "created_at": time.time(),
-                    "updated_at": time.time(),
-                    "request": {"prompt": "Unknown request", "selected_services": []},
-                    "service_results": []
-                }
+                transaction = Transaction(
+                    prompt="Unknown request",
+                    created_at=now,
+                    created_monotonic=now_monotonic,
+                    updated_at=now,
+                    steps=["Request received"]
+                )
                 self.transactions[transaction_id] = transaction
-                
-            # Calculate time elapsed since request creation
-            time_elapsed = time.time() - transaction.get("created_at", 0)
             
-            # Get request data for reference
-            request_data = transaction.get("request", {})
-            selected_services = request_data.get("selected_services", [])
-            service_count = len(selected_services)
+            # Collect DeFi Llama results once the background query has finished
+            future = transaction.defillama_future
+            if future is not None and future.done():
+                transaction.defillama_future = None
+                self._store_defillama_results(transaction, future)
+                
+            # Calculate time elapsed since request creation, immune to wall-clock jumps
+            time_elapsed = now_monotonic - transaction.created_monotonic
             
-            # Initialize service results if not already present
-            if "service_results" not in transaction:
-                transaction["service_results"] = []
-                # Create initial results for each service
-                for idx, service in enumerate(selected_services):
-                    service_id = service.get("service_id", f"unknown-{idx}")
-                    transaction["service_results"].append({
-                        "service_id": service_id,
-                        "name": service.get("description", f"Service {service_id}").split(" - ")[0],
-                        "status": "pending",
-                        "progress": 0,
-                        "start_time": None,
-                        "execution_steps": [],
-                        "result": None,
-                        "error": None
-                    })
+            # Get the prompt and the lists updated below for reference
+            prompt = transaction.prompt
+            steps = transaction.steps
+            service_results = transaction.service_results
             
             # Update the execution status based on time elapsed
             if time_elapsed < 3:
                 # Initial phase - request received and validating
-                transaction["status"] = "pending"
-                steps = transaction.get("steps", [])
+                transaction.status = "pending"
                 if len(steps) == 0:
                     steps.append("Request received")
                 if len(steps) == 1 and time_elapsed > 1:
                     steps.append("Validating request parameters")
-                transaction["steps"] = steps
             elif time_elapsed < 30:
                 # Running phase - update steps based on time elapsed
-                transaction["status"] = "running"
-                
-                # Define the expected timeline of steps
-                timeline = [
-                    (3, "Query Analysis - Understanding request parameters"),
-                    (6, "Parameter Inference - Determining optimal service parameters"),
-                    (10, "API Execution - Connecting to external data sources"),
-                    (15, "Service Processing - Running analysis on retrieved data"),
-                    (20, "Data Aggregation - Combining results from different services"),
-                    (25, "Result Generation - Preparing final response")
-                ]
+                transaction.status = "running"
                 
-                # Update steps based on time
-                steps = transaction.get("steps", [])
-                for threshold, step in timeline:
-                    if time_elapsed >= threshold and step not in steps:
-                        steps.append(step)
-                transaction["steps"] = steps
+                # Append the timeline steps reached since the last poll, an idle
+                # poll costs a single comparison
+                timeline_index = reached = transaction.timeline_index
+                while reached < len(_TIMELINE) and time_elapsed >= _TIMELINE[reached][0]:
+                    steps.append(_TIMELINE[reached][1])
+                    reached += 1
+                if reached != timeline_index:
+                    transaction.timeline_index = transaction.current_step = reached
                 
                 # Update service-specific statuses
-                for idx, service_result in enumerate(transaction.get("service_results", [])):
+                for idx, service_result in enumerate(service_results):
                     # Stagger service execution to make it look realistic
                     service_delay = idx * 4  # seconds between service starts
                     service_time_elapsed = time_elapsed - service_delay
                     
                     if service_time_elapsed <= 0:
-                        # Service not started yet
+                        # Service not started yet, nor any of the later ones
+                        break
+                    
+                    if service_result["status"] in ("completed", "failed"):
+                        # Nothing changes for a service once it has completed or failed
                         continue
-                        
+                    
                     # Set start time if not set
                     if not service_result["start_time"]:
-                        service_result["start_time"] = time.time() - service_time_elapsed
+                        service_result["start_time"] = now - service_time_elapsed
                     
                     # Update service status based on service_time_elapsed
                     if service_time_elapsed < 2:
@@ -367,178 +722,165 @@ class MCPService:
                         service_result["progress"] = min(95, int(service_time_elapsed / 20 * 100))
                         
                         # Add execution steps for this service
-                        execution_steps = service_result.get("execution_steps", [])
-                        service_timeline = [
-                            (1, "Initializing service"),
-                            (3, "Loading data sources"),
-                            (6, "Processing request"),
-                            (10, "Analyzing results"),
-                            (15, "Preparing response")
-                        ]
-                        
-                        for step_time, step_desc in service_timeline:
-                            if service_time_elapsed >= step_time and step_desc not in execution_steps:
-                                execution_steps.append(step_desc)
-                        
-                        service_result["execution_steps"] = execution_steps
+                        # (execution_steps only ever holds a prefix of the service timeline here)
+                        execution_steps = service_result["execution_steps"]
+                        step_index = len(execution_steps)
+                        while step_index < len(_SERVICE_TIMELINE) and service_time_elapsed >= _SERVICE_TIMELINE[step_index][0]:
+                            execution_steps.append(_SERVICE_TIMELINE[step_index][1])
+                            step_index += 1
                     else:
                         # Service complete
                         service_result["status"] = "completed"
                         service_result["progress"] = 100
                         
-                        # Ensure all steps are included
-                        if len(service_result.get("execution_steps", [])) < 5:
-                            service_result["execution_steps"] = [
-                                "Initializing service",
-                                "Loading data sources",
-                                "Processing request",
-                                "Analyzing results",
-                                "Preparing response",
-                                "Finalizing"
-                            ]
+                        # Ensure all steps are included, completing the timeline prefix in place
+                        execution_steps = service_result["execution_steps"]
+                        if len(execution_steps) < 5:
+                            execution_steps.extend(_SERVICE_FINAL_STEPS[len(execution_steps):])
                         
                         # Add a result if not already present
                         if not service_result["result"]:
                             service_id = service_result["service_id"]
-                            prompt = request_data.get("prompt", "")
                             
                             # Generate a relevant mock result based on service ID and prompt
                             service_result["result"] = {
-                                "confidence": random.uniform(0.75, 0.98),
-                                "output": self._generate_mock_output(service_id, prompt),
-                                "processing_time": random.uniform(1.5, 3.5)
+                                "confidence": _rng.uniform(0.75, 0.98),
+                                "output": self._generate_mock_output(service_id, _classify_prompt(prompt)),
+                                "processing_time": _rng.uniform(1.5, 3.5)
                             }
             else:
                 # Completed phase
-                transaction["status"] = "completed"
+                transaction.status = "completed"
                 
-                # Make sure all services are completed
-                for service_result in transaction.get("service_results", []):
-                    service_result["status"] = "completed"
-                    service_result["progress"] = 100
+                # Services and the final result are settled on the first completed
+                # poll, later ones only wait for the DeFi Llama data
+                if not transaction.result:
+                    # Classify the prompt once for the service outputs, the summary
+                    # and the aggregated data
+                    category = _classify_prompt(prompt)
                     
-                    # Ensure service has a result
-                    if not service_result["result"]:
-                        service_id = service_result["service_id"]
-                        prompt = request_data.get("prompt", "")
-                        service_result["result"] = {
-                            "confidence": random.uniform(0.85, 0.99),
-                            "output": self._generate_mock_output(service_id, prompt),
-                            "processing_time": random.uniform(2.0, 4.0)
-                        }
-                
-                # Generate an aggregated result if not already present
-                if not transaction["result"]:
-                    # Create a structured result combining individual service results
-                    final_result = {
-                        "timestamp": time.time(),
-                        "transaction_id": transaction_id,
-                        "status": "success",
-                        "results": {
-                            "summary": self._generate_summary_for_prompt(request_data.get("prompt", "")),
-                            "details": [],
-                            "aggregate_result": {},
-                            "recommendations": []
-                        }
-                    }
+                    # Make sure all services are completed, failed ones stay failed
+                    missing_results = []
+                    for service_result in service_results:
+                        if service_result["status"] == "failed":
+                            continue
+                        service_result["status"] = "completed"
+                        service_result["progress"] = 100
+                        if not service_result["result"]:
+                            missing_results.append(service_result)
                     
-                    # Add individual service results to the details
-                    for service_result in transaction.get("service_results", []):
-                        service_detail = {
-                            "service_id": service_result["service_id"],
-                            "name": service_result["name"],
-                            "confidence": service_result["result"]["confidence"],
-                            "output": service_result["result"]["output"],
-                            "processing_time": service_result["result"]["processing_time"]
-                        }
-                        final_result["results"]["details"].append(service_detail)
+                    # Ensure every service has a result, drawing the random values for
+                    # all of them in one batch
+                    if missing_results:
+                        draws = [_rng.random() for _ in range(2 * len(missing_results))]
+                        for service_result, confidence, processing_time in zip(missing_results, draws[::2], draws[1::2]):
+                            service_result["result"] = {
+                                "confidence": 0.85 + 0.14 * confidence,
+                                "output": self._generate_mock_output(service_result["service_id"], category),
+                                "processing_time": 2.0 + 2.0 * processing_time
+                            }
+                    
+                    # Generate an aggregated result
+                    summary = self._generate_summary_for_prompt(category)
+                    
+                    # Draw the random values for the aggregated data and the
+                    # recommendations in one batch, scaling each to its range
+                    draws = [_rng.random() for _ in range(6)]
                     
                     # Add aggregated data
-                    prompt = request_data.get("prompt", "").lower()
-                    if "apy" in prompt or "yield" in prompt:
-                        final_result["results"]["aggregate_result"] = {
-                            "average_apy": random.uniform(3.5, 12.8),
-                            "highest_apy": random.uniform(15.0, 40.0),
-                            "lowest_risk": random.uniform(1.5, 4.5),
+                    if category == "yield":
+                        aggregate_result = {
+                            "average_apy": 3.5 + 9.3 * draws[0],
+                            "highest_apy": 15.0 + 25.0 * draws[1],
+                            "lowest_risk": 1.5 + 3.0 * draws[2],
                             "timeframe": "30 days"
                         }
-                    elif "price" in prompt or "value" in prompt:
-                        final_result["results"]["aggregate_result"] = {
-                            "price_change": random.uniform(-15.0, 25.0),
-                            "market_sentiment": random.choice(["bullish", "neutral", "bearish"]),
-                            "volume_change": random.uniform(-10.0, 30.0),
+                    elif category == "price":
+                        aggregate_result = {
+                            "price_change": -15.0 + 40.0 * draws[0],
+                            "market_sentiment": _SENTIMENTS[int(draws[1] * len(_SENTIMENTS))],
+                            "volume_change": -10.0 + 40.0 * draws[2],
                             "timeframe": "7 days"
                         }
                     else:
-                        final_result["results"]["aggregate_result"] = {
-                            "total_tvl": f"${random.randint(50, 200)}B",
-                            "protocols_analyzed": random.randint(15, 50),
-                            "confidence_level": random.uniform(0.85, 0.97)
+                        aggregate_result = {
+                            "total_tvl": f"${50 + int(draws[0] * 151)}B",
+                            "protocols_analyzed": 15 + int(draws[1] * 36),
+                            "confidence_level": 0.85 + 0.12 * draws[2]
                         }
                     
-                    # Add recommendations
-                    recommendations = [
-                        f"Consider exploring {random.choice(['Uniswap V3', 'Aave', 'Compound', 'Curve'])} for better rates",
-                        f"Monitor {random.choice(['price fluctuations', 'APY changes', 'TVL shifts'])} over the next week",
-                        f"Diversify across {random.randint(2, 5)} different protocols to minimize risk"
-                    ]
-                    final_result["results"]["recommendations"] = recommendations
-                    
-                    # Store the final result as JSON
-                    transaction["result"] = json.dumps(final_result)
+                    # Create a structured result combining individual service results in
+                    # one go, rather than filling in placeholders afterwards. It is stored
+                    # as is, serializing is left to the caller
+                    transaction.result = {
+                        "timestamp": now,
+                        "transaction_id": transaction_id,
+                        "status": "success",
+                        "results": {
+                            "summary": summary,
+                            # service_id and name were resolved once at submit time
+                            "details": [
+                                {
+                                    "service_id": service_result["service_id"],
+                                    "name": service_result["name"],
+                                    "confidence": service_result["result"]["confidence"],
+                                    "output": service_result["result"]["output"],
+                                    "processing_time": service_result["result"]["processing_time"]
+                                }
+                                for service_result in service_results
+                                if service_result["status"] != "failed"
+                            ],
+                            "aggregate_result": aggregate_result,
+                            "recommendations": [
+                                f"Consider exploring {_RECOMMENDED_PROTOCOLS[int(draws[3] * len(_RECOMMENDED_PROTOCOLS))]} for better rates",
+                                f"Monitor {_MONITORED_METRICS[int(draws[4] * len(_MONITORED_METRICS))]} over the next week",
+                                f"Diversify across {2 + int(draws[5] * 4)} different protocols to minimize risk"
+                            ]
+                        }
+                    }
             
-            # Save updates back to the transaction record
-            self.transactions[transaction_id] = transaction
+            # Record the poll with the clock reading taken above
+            transaction.updated_at = now
+            
+            # Once completed (and DeFi Llama data collected) the status is final
+            if transaction.status == "completed" and transaction.defillama_future is None:
+                transaction.final = True
             
-            # Return status object
-            return {
-                "status": transaction["status"],
-                "steps": transaction["steps"],
-                "service_results": transaction.get("service_results", []),
-                "result": transaction["result"],
-                "error": transaction["error"],
-                "defillama_data": transaction.get("defillama_data", None)
-            }
+            # Return the transaction's own status view, it stays up to date
+            # across polls so there is nothing to rebuild
+            return transaction.status_view
         else:
             # In a real implementation, this would call the actual MCP API
             # This would use the REST API to get the status of the transaction
             pass
     
-    def _generate_mock_output(self, service_id: str, prompt: str) -> str:
-        """Generate a mock output based on service ID and prompt"""
-        prompt_lower = prompt.lower()
-        
-        # Different outputs based on service types
-        if service_id == "1722":  # DeFi Analytics
-            if "apy" in prompt_lower or "yield" in prompt_lower:
-                return f"Analysis of APY rates across major DeFi protocols shows an average of {random.uniform(4.5, 15.2):.2f}% APY in the last 30 days. Uniswap V3 liquidity pools for stablecoins have shown consistent returns of {random.uniform(3.0, 8.0):.2f}% APY."
-            else:
-                return f"DeFi TVL analysis shows ${random.randint(40, 100)}B locked across all protocols, with a {random.uniform(-5.0, 10.0):.1f}% change in the last week. Top 3 protocols by TVL are currently MakerDAO, Aave, and Curve."
-        
-        elif service_id == "1815":  # Token Price Analysis
-            tokens = ["ETH", "OLAS", "UNI", "AAVE", "CRV", "MKR"]
-            token = random.choice(tokens)
-            return f"Price analysis for {token} indicates a {random.uniform(-15.0, 25.0):.1f}% change over the past 7 days with volatility at {random.uniform(20.0, 80.0):.1f}%. Technical indicators suggest a {random.choice(['bullish', 'neutral', 'bearish'])} trend in the short term."
-        
-        elif service_id == "1999":  # Yield Farming Optimizer
-            protocols = ["Curve", "Convex", "Yearn", "Compound", "Aave"]
-            return f"Current highest yield opportunities: {random.choice(protocols)} {random.uniform(5.0, 25.0):.2f}% APY for stablecoins, {random.choice(protocols)} {random.uniform(10.0, 50.0):.2f}% APY for {random.choice(['ETH-USDC', 'BTC-ETH', 'OLAS-ETH'])} pairs."
-        
-        else:  # Generic response for other services
-            return f"Analysis complete. Found {random.randint(3, 15)} relevant data points with {random.uniform(80.0, 98.0):.1f}% confidence. The most significant factor identified was {random.choice(['liquidity depth', 'price volatility', 'protocol adoption', 'gas costs', 'market sentiment'])}."
+    def get_execution_status_json(self, transaction_id: str) -> bytes:
+        """Get status of a request execution encoded as JSON"""
+        status = self.get_execution_status(transaction_id)
+        if status is None:
+            return _json_dumps(None)
+        transaction = self.transactions.get(transaction_id)
+        if transaction is not None and transaction.final:
+            # Final statuses no longer change, encode them only once
+            if transaction.response_bytes is None:
+                transaction.response_bytes = _json_dumps(dict(status))
+            return transaction.response_bytes
+        return _json_dumps(dict(status))
     
-    def _generate_summary_for_prompt(self, prompt: str) -> str:
-        """Generate a relevant summary based on the user's prompt"""
-        prompt_lower = prompt.lower()
-        
-        if "apy" in prompt_lower or "yield" in prompt_lower:
-            return f"Your request for yield analysis has been processed. We analyzed {random.randint(10, 50)} protocols and found APY rates ranging from {random.uniform(0.5, 5.0):.2f}% to {random.uniform(15.0, 50.0):.2f}%. The most stable yields were observed in {random.choice(['stablecoin pairs', 'ETH-based pools', 'blue-chip token farms'])}."
+    def _generate_mock_output(self, service_id: str, category: str) -> str:
+        """Generate a mock output based on service ID and prompt category"""
+        return _SERVICE_OUTPUT_HANDLERS.get(service_id, _generic_output)(category)
+    
+    def _generate_summary_for_prompt(self, category: str) -> str:
+        """Generate a relevant summary based on the category of the user's prompt"""
+        if category == "yield":
+            return f"Your request for yield analysis has been processed. We analyzed {_rng.randint(10, 50)} protocols and found APY rates ranging from {_rng.uniform(0.5, 5.0):.2f}% to {_rng.uniform(15.0, 50.0):.2f}%. The most stable yields were observed in {_rng.choice(['stablecoin pairs', 'ETH-based pools', 'blue-chip token farms'])}."
         
-        elif "price" in prompt_lower or "value" in prompt_lower:
-            return f"Price analysis complete. The requested assets have shown {random.choice(['high volatility', 'stable performance', 'upward momentum'])} over the past {random.randint(7, 30)} days. Market sentiment is currently {random.choice(['bullish', 'neutral', 'bearish'])} based on on-chain metrics and trading volumes."
+        elif category == "price":
+            return f"Price analysis complete. The requested assets have shown {_rng.choice(['high volatility', 'stable performance', 'upward momentum'])} over the past {_rng.randint(7, 30)} days. Market sentiment is currently {_rng.choice(['bullish', 'neutral', 'bearish'])} based on on-chain metrics and trading volumes."
             
-        elif "risk" in prompt_lower:
-            return f"Risk assessment complete. The analyzed protocols show {random.choice(['low', 'moderate', 'varying'])} risk profiles. Key factors affecting risk include protocol maturity, TVL stability, and audit history. Recommended diversification across {random.randint(3, 7)} different protocols to minimize exposure."
+        elif category == "risk":
+            return f"Risk assessment complete. The analyzed protocols show {_rng.choice(['low', 'moderate', 'varying'])} risk profiles. Key factors affecting risk include protocol maturity, TVL stability, and audit history. Recommended diversification across {_rng.randint(3, 7)} different protocols to minimize exposure."
             
         else:
-            return f"Analysis of your request has been completed successfully. Our services processed the data using {random.randint(3, 8)} different methodologies to ensure accuracy. The results provide a comprehensive view of the current market conditions relevant to your query." 
\ No newline at end of file
+            return f"Analysis of your request has been completed successfully. Our services processed the data using {_rng.randint(3, 8)} different methodologies to ensure accuracy. The results provide a comprehensive view of the current market conditions relevant to your query." 
\ No newline at end of file
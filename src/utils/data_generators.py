@@ -1,36 +1,106 @@
 """Utility functions for generating mock data for different result types"""
+import os
+import re
+import copy
 import random
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+import asyncio
+import hashlib
+import logging
+import functools
+import threading
+import numpy as np
+from types import MappingProxyType
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+from cachetools import TLRUCache
+from openai import RateLimitError
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 from langchain.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import JsonOutputParser
 
-def generate_analytics_result(service_name, request_text=""):
-    """Generate mock analytics results based on the request text"""
-    current_date = datetime.now()
-    data_points = []
-    
-    # Generate 10 data points for the past 10 days
-    for i in range(10):
-        date_point = current_date - timedelta(days=i)
-        value_point = random.uniform(80, 120)
-        change_pct = random.uniform(-5, 5)
-        data_points.append({
-            "date": date_point.strftime("%Y-%m-%d"),
-            "value": round(value_point, 2),
-            "change_pct": round(change_pct, 2)
-        })
-    
-    # Reverse to get chronological order
-    data_points.reverse()
-    
-    # Create a prompt for the LLM to generate detailed analysis
-    if request_text:
-        try:
-            llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.3)
-            analytics_prompt = ChatPromptTemplate.from_template(
-                """You are a DeFi analytics service providing insights on market trends.
+logger = logging.getLogger(__name__)
+
+# Shared generator for the mock series, drawing whole arrays per call
+_RNG = np.random.default_rng()
+
+# Prediction tokens as (name, min price, max price, decimals)
+_PREDICTION_TOKENS = (
+    ("ETH", 1500, 3500, 2),
+    ("BTC", 25000, 60000, 2),
+    ("MATIC", 0.5, 1.5, 4),
+    ("LINK", 5, 15, 2),
+    ("UNI", 3, 10, 2),
+    ("AAVE", 50, 200, 2)
+)
+_PREDICTION_LOWS = np.array([token[1] for token in _PREDICTION_TOKENS])
+_PREDICTION_HIGHS = np.array([token[2] for token in _PREDICTION_TOKENS])
+
+# Relative price change bounds for the 24h, 7d and 30d predictions
+_PREDICTION_CHANGE_LOWS = np.array([-0.05, -0.15, -0.25])
+_PREDICTION_CHANGE_HIGHS = np.array([0.07, 0.2, 0.35])
+
+# Popular feed tokens and their recent price ranges
+_FEED_TOKENS = {
+    "ETH": {"min": 1500, "max": 3500, "decimals": 2},
+    "BTC": {"min": 25000, "max": 65000, "decimals": 2},
+    "MATIC": {"min": 0.5, "max": 1.5, "decimals": 4},
+    "AAVE": {"min": 50, "max": 200, "decimals": 2},
+    "UNI": {"min": 3, "max": 8, "decimals": 3}
+}
+
+# Feed keywords found in one pass over the request. Token names match anywhere,
+# as in "stETH" or "WBTC", longer names first so "ethereum" is not consumed as
+# "eth". Feed type keywords match at word starts
+_FEED_TERMS = re.compile(
+    r"(ethereum|bitcoin|matic|aave|uni|eth|btc)|\b(volume|liquidity|trading|yield|apr|apy|interest|gas|fee|transaction)",
+    re.IGNORECASE
+)
+# Token names standing for a feed token's ticker
+_FEED_TOKEN_ALIASES = {"ethereum": "eth"}
+_FEED_TYPE_TERMS = (
+    ("market", frozenset(("volume", "liquidity", "trading"))),
+    ("yield", frozenset(("yield", "apr", "apy", "interest"))),
+    ("gas", frozenset(("gas", "fee", "transaction")))
+)
+
+def _dates(day_offsets) -> List[str]:
+    """Format today plus each day offset as %Y-%m-%d"""
+    today = np.datetime64(datetime.now().date(), "D")
+    return (today + np.asarray(day_offsets)).astype(str).tolist()
+
+def _timestamps(minutes_ago) -> List[str]:
+    """Format now minus each minute offset as %Y-%m-%d %H:%M:%S"""
+    now = np.datetime64(datetime.now(), "s")
+    stamps = now - np.asarray(minutes_ago) * np.timedelta64(60, "s")
+    return np.char.replace(stamps.astype(str), "T", " ").tolist()
+
+def _format(template, values) -> List[str]:
+    """Format every value of an array with a %-style template in one call"""
+    return np.char.mod(template, values).tolist()
+
+# Event loop shared by all generators, running in a background thread so the
+# sync wrappers can be called from Streamlit's script thread
+_LOOP = None
+_LOOP_LOCK = threading.Lock()
+
+def _event_loop():
+    """Get the shared generator event loop, starting it on first use"""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            _LOOP = asyncio.new_event_loop()
+            threading.Thread(target=_LOOP.run_forever, name="data-generators", daemon=True).start()
+    return _LOOP
+
+def run_async(coro):
+    """Run a coroutine on the shared generator event loop and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop()).result()
+
+# Prompt templates by result type, parsed once at import
+_PROMPTS = {
+    "analytics": ChatPromptTemplate.from_template(
+        """You are a DeFi analytics service providing insights on market trends.
                 Based on this request, generate a detailed market analysis:
                 
                 Request: {request_text}
@@ -46,10 +116,192 @@ def generate_analytics_result(service_name, request_text=""):
                 
                 All sections should be specific to the request provided.
                 """
-            )
-            
-            analytics_chain = analytics_prompt | llm | JsonOutputParser()
-            result = analytics_chain.invoke({
+    ),
+    "prediction": ChatPromptTemplate.from_template(
+        """You are a price prediction service for cryptocurrency markets.
+                Based on this request, generate a market forecast and analysis:
+                
+                Request: {request_text}
+                Service: {service_name}
+                
+                Format your response as a JSON object with these sections:
+                - title: A descriptive title for the forecast
+                - summary: A concise overview of the forecast (3-4 sentences)
+                - market_sentiment: Overall market sentiment (bullish, bearish, or neutral) with explanation
+                - key_indicators: Array of 3-4 technical indicators supporting the forecast
+                - catalysts: Array of 3-4 potential market catalysts that could impact prices
+                - recommendations: Array of 2-3 strategic recommendations
+                
+                All sections should be specific to the request provided.
+                """
+    ),
+    "token": ChatPromptTemplate.from_template(
+        """You are a token analysis service providing insights on cryptocurrencies.
+                Based on this request, generate a token analysis:
+                
+                Request: {request_text}
+                Service: {service_name}
+                
+                Format your response as a JSON object with these sections:
+                - title: A descriptive title for the token analysis
+                - summary: A concise overview of the token (3-4 sentences)
+                - strengths: Array of 3-4 strengths of the token/project
+                - weaknesses: Array of 2-3 weaknesses or concerns
+                - technical_indicators: Object with 3-4 technical indicators and their values
+                - fundamental_factors: Array of 3-4 fundamental factors affecting the token
+                - investment_outlook: Short, medium, and long-term outlook
+                
+                All sections should be specific to the request provided.
+                """
+    ),
+    "data_feed": ChatPromptTemplate.from_template(
+        """You are a DeFi data feed service. Generate details for a data feed based on this request:
+                
+                Request: {request_text}
+                Feed Type: {feed_type}
+                Selected Tokens: {tokens}
+                
+                Respond with a JSON object containing:
+                - title: A title for the data feed
+                - description: A detailed description of what data is being provided
+                - source: The name of a realistic DeFi data aggregator (like "DeFi Pulse Analytics")
+                - update_frequency: How often the data is updated (e.g., "5 minutes", "hourly")
+                - data_quality_score: A quality score between 0.85 and 0.99
+                - recommendation: A brief analysis of the data (2-3 sentences)
+                """
+    ),
+    "optimization": ChatPromptTemplate.from_template(
+        """You are a DeFi optimization service suggesting improvements to yield strategies.
+                Based on this request, generate optimization recommendations:
+                
+                Request: {request_text}
+                Service: {service_name}
+                
+                Format your response as a JSON object with these sections:
+                - title: A descriptive title for the optimization recommendation
+                - summary: A concise overview of the optimization strategy (3-4 sentences)
+                - current_strategy: Description of typical current approach
+                - optimized_strategy: Detailed explanation of the recommended optimized approach
+                - benefits: Array of 3-4 specific benefits
+                - considerations: Array of 2-3 important considerations or risks
+                - implementation_steps: Array of 4-5 steps to implement the optimization
+                
+                All sections should be specific to the request provided.
+                """
+    )
+}
+
+# Chat model settings, shared with the Batch API requests
+_MODEL = "gpt-3.5-turbo"
+_TEMPERATURE = 0.3
+
+# OpenAI chat roles of the prompt message types
+_OPENAI_ROLES = {"human": "user", "ai": "assistant", "system": "system"}
+
+@functools.lru_cache(maxsize=None)
+def _llm():
+    """Chat model shared by all generators, created on first use so importing
+    this module doesn't require an API key"""
+    return ChatOpenAI(model=_MODEL, temperature=_TEMPERATURE)
+
+@functools.lru_cache(maxsize=None)
+def _chain(result_type):
+    """Prompt, model and JSON parser chain of a result type, built once"""
+    return _PROMPTS[result_type] | _llm() | JsonOutputParser()
+
+# Seconds an LLM answer is reused for the same input, gas prices go stale sooner
+_LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "900"))
+_GAS_FEED_CACHE_TTL = 30.0
+
+def answer_ttl(result_type, payload):
+    """Seconds an LLM answer for a chain input stays cached"""
+    if result_type == "data_feed" and payload.get("feed_type") == "gas":
+        return _GAS_FEED_CACHE_TTL
+    return _LLM_CACHE_TTL
+
+# Concurrent LLM calls across all generators, kept under the provider's rate limits
+_LLM_SEMAPHORE = asyncio.Semaphore(int(os.getenv("OLAS_LLM_CONCURRENCY", "8")))
+
+def _rate_limit_retrying():
+    """Retry policy for rate limited LLM calls, backing off exponentially with jitter"""
+    return AsyncRetrying(
+        retry=retry_if_exception_type(RateLimitError),
+        wait=wait_random_exponential(multiplier=1, max=20),
+        stop=stop_after_attempt(5),
+        reraise=True
+    )
+
+# Entries are (ttl, answer) so each one can expire after its own TTL. Only the
+# event loop thread touches the cache, so it needs no lock
+_LLM_CACHE = TLRUCache(maxsize=1024, ttu=lambda key, value, now: now + value[0])
+
+def _cache_key(result_type, payload):
+    """LLM cache key of a result type and its chain input"""
+    return hashlib.sha256(repr((result_type, sorted(payload.items()))).encode()).digest()
+
+async def _cached_ainvoke(result_type, payload, ttl=None):
+    """Invoke the chain of a result type, reusing a recent answer for the same input"""
+    key = _cache_key(result_type, payload)
+    cached = _LLM_CACHE.get(key)
+    if cached is None:
+        # Take a concurrency slot per attempt, so backoff sleeps don't hold one
+        async for attempt in _rate_limit_retrying():
+            with attempt:
+                async with _LLM_SEMAPHORE:
+                    answer = await _chain(result_type).ainvoke(payload)
+        cached = (ttl or _LLM_CACHE_TTL, answer)
+        _LLM_CACHE[key] = cached
+    # Generators add their random data to the answer, so hand out a copy
+    return copy.deepcopy(cached[1])
+
+async def _store_answer(result_type, payload, answer, ttl=None):
+    """Cache an answer obtained outside the chain, on the event loop thread"""
+    _LLM_CACHE[_cache_key(result_type, payload)] = (ttl or _LLM_CACHE_TTL, answer)
+
+def cache_answer(result_type, payload, answer, ttl=None):
+    """Cache an LLM answer for a chain input, so the generator of the result type
+    uses it instead of calling the LLM"""
+    run_async(_store_answer(result_type, payload, answer, ttl))
+
+async def _cached_astream(result_type, payload, ttl=None):
+    """Stream the partial answers of the chain of a result type, caching the final
+    answer. A cached answer is yielded once as it is already complete"""
+    key = _cache_key(result_type, payload)
+    cached = _LLM_CACHE.get(key)
+    if cached is not None:
+        yield copy.deepcopy(cached[1])
+        return
+    
+    # Partial answers may already be shown, so a stream is not retried
+    answer = None
+    async with _LLM_SEMAPHORE:
+        async for answer in _chain(result_type).astream(payload):
+            yield copy.deepcopy(answer)
+    if answer is not None:
+        _LLM_CACHE[key] = (ttl or _LLM_CACHE_TTL, answer)
+
+def _analytics_chart_data():
+    """Generate 10 data points for the past 10 days in chronological order"""
+    values = _RNG.uniform(80, 120, size=10).round(2).tolist()
+    changes = _RNG.uniform(-5, 5, size=10).round(2).tolist()
+    
+    return [
+        {
+            "date": date_point,
+            "value": value_point,
+            "change_pct": change_pct
+        }
+        for date_point, value_point, change_pct in zip(_dates(np.arange(-9, 1)), values, changes)
+    ]
+
+async def agenerate_analytics_result(service_name, request_text=""):
+    """Generate mock analytics results based on the request text"""
+    data_points = _analytics_chart_data()
+    
+    # Create a prompt for the LLM to generate detailed analysis
+    if request_text:
+        try:
+            result = await _cached_ainvoke("analytics", {
                 "request_text": request_text,
                 "service_name": service_name
             })
@@ -59,97 +311,156 @@ def generate_analytics_result(service_name, request_text=""):
             
             return result
         except Exception as e:
-            print(f"Error generating analytics content: {str(e)}")
+            logger.error("Error generating analytics content: %s", e)
             # Fall through to default
     
     # Default analytics result if no request text or if generation fails
+    return _default_analytics_result(service_name, data_points)
+
+# Constant part of the default analytics result. Default results are built by
+# overlaying the per-call fields on these templates, so their lists are shared
+# and must not be mutated. None entries only fix the key order
+_DEFAULT_ANALYTICS_RESULT = MappingProxyType({
+    "title": None,
+    "summary": "Analysis of current market trends and key metrics across DeFi protocols.",
+    "chart_data": None,
+    "key_metrics": None,
+    "trends": [
+        "Increased adoption of Layer 2 solutions for reduced gas fees",
+        "Growing interest in decentralized derivatives platforms",
+        "Yield farming opportunities shifting to newer protocols"
+    ],
+    "insights": [
+        "Consider diversifying liquidity across multiple protocols to mitigate risk",
+        "Monitor regulatory developments that may impact protocol governance",
+        "Focus on protocols with sustainable tokenomics and real yield"
+    ],
+    "risks": [
+        "Smart contract vulnerabilities remain a significant concern",
+        "Market volatility could impact capital efficiency",
+        "Regulatory uncertainties in major markets"
+    ]
+})
+
+def _default_analytics_result(service_name, data_points):
+    """Analytics result used without request text or when generation fails"""
     return {
+        **_DEFAULT_ANALYTICS_RESULT,
         "title": f"{service_name} Market Analysis",
-        "summary": "Analysis of current market trends and key metrics across DeFi protocols.",
         "chart_data": data_points,
         "key_metrics": {
             "total_tvl": f"${random.randint(40, 200)}B",
             "daily_volume": f"${random.randint(5, 30)}B",
             "avg_yield": f"{random.uniform(2, 8):.2f}%",
             "volatility_index": round(random.uniform(20, 60), 1)
-        },
-        "trends": [
-            "Increased adoption of Layer 2 solutions for reduced gas fees",
-            "Growing interest in decentralized derivatives platforms",
-            "Yield farming opportunities shifting to newer protocols"
-        ],
-        "insights": [
-            "Consider diversifying liquidity across multiple protocols to mitigate risk",
-            "Monitor regulatory developments that may impact protocol governance",
-            "Focus on protocols with sustainable tokenomics and real yield"
-        ],
-        "risks": [
-            "Smart contract vulnerabilities remain a significant concern",
-            "Market volatility could impact capital efficiency",
-            "Regulatory uncertainties in major markets"
-        ]
+        }
     }
 
-def generate_prediction_result(service_name, request_text=""):
+def generate_analytics_result(service_name, request_text=""):
+    """Generate mock analytics results based on the request text"""
+    return run_async(agenerate_analytics_result(service_name, request_text))
+
+async def astream_analytics_result(service_name, request_text=""):
+    """Stream mock analytics results as the LLM writes them. Every partial result
+    carries the chart data, so the chart can render before the text is done"""
+    data_points = _analytics_chart_data()
+    
+    if request_text:
+        try:
+            async for result in _cached_astream("analytics", {
+                "request_text": request_text,
+                "service_name": service_name
+            }):
+                result["chart_data"] = data_points
+                yield result
+            return
+        except Exception as e:
+            logger.error("Error streaming analytics content: %s", e)
+            # Fall through to default
+    
+    yield _default_analytics_result(service_name, data_points)
+
+def stream_analytics_result(service_name, request_text=""):
+    """Stream mock analytics results from the shared event loop, for sync callers"""
+    stream = astream_analytics_result(service_name, request_text)
+    try:
+        while True:
+            try:
+                yield run_async(stream.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        run_async(stream.aclose())
+
+# Constant part of the default prediction result
+_DEFAULT_PREDICTION_RESULT = MappingProxyType({
+    "title": None,
+    "summary": "Forecast of cryptocurrency price movements based on technical and fundamental analysis.",
+    "predictions": None,
+    "forecast_data": None,
+    "market_sentiment": None,
+    "key_indicators": [
+        "Moving Average Convergence Divergence (MACD) showing positive momentum",
+        "Relative Strength Index (RSI) in neutral territory with room for growth",
+        "Support levels holding firm across major assets"
+    ],
+    "catalysts": [
+        "Upcoming protocol upgrades for Ethereum",
+        "Institutional adoption continuing to increase",
+        "Regulatory developments in key markets"
+    ],
+    "recommendations": [
+        "Consider dollar-cost averaging into major assets",
+        "Set stop-losses to protect against market volatility",
+        "Monitor on-chain metrics for early signs of trend changes"
+    ]
+})
+
+async def agenerate_prediction_result(service_name, request_text=""):
     """Generate mock prediction results based on the request text"""
     # Define token names and current prices
+    prices = _RNG.uniform(_PREDICTION_LOWS, _PREDICTION_HIGHS)
     tokens = {
-        "ETH": round(random.uniform(1500, 3500), 2),
-        "BTC": round(random.uniform(25000, 60000), 2),
-        "MATIC": round(random.uniform(0.5, 1.5), 4),
-        "LINK": round(random.uniform(5, 15), 2),
-        "UNI": round(random.uniform(3, 10), 2),
-        "AAVE": round(random.uniform(50, 200), 2)
+        name: round(price, decimals)
+        for (name, _, _, decimals), price in zip(_PREDICTION_TOKENS, prices.tolist())
     }
     
     # Generate prediction percentages for different timeframes
-    predictions = {}
-    for token, price in tokens.items():
-        predictions[token] = {
+    current_prices = np.fromiter(tokens.values(), dtype=float, count=len(tokens))
+    multipliers = 1 + _RNG.uniform(_PREDICTION_CHANGE_LOWS, _PREDICTION_CHANGE_HIGHS, size=(len(tokens), 3))
+    predicted = (current_prices[:, None] * multipliers).round(2).tolist()
+    confidences = _RNG.uniform(0.6, 0.9, size=len(tokens)).round(2).tolist()
+    
+    predictions = {
+        token: {
             "current_price": price,
-            "prediction_24h": round(price * (1 + random.uniform(-0.05, 0.07)), 2),
-            "prediction_7d": round(price * (1 + random.uniform(-0.15, 0.2)), 2),
-            "prediction_30d": round(price * (1 + random.uniform(-0.25, 0.35)), 2),
-            "confidence": round(random.uniform(0.6, 0.9), 2)
+            "prediction_24h": prediction_24h,
+            "prediction_7d": prediction_7d,
+            "prediction_30d": prediction_30d,
+            "confidence": confidence
         }
+        for (token, price), (prediction_24h, prediction_7d, prediction_30d), confidence
+        in zip(tokens.items(), predicted, confidences)
+    }
     
     # Create forecast data for chart
-    forecast_data = []
-    current_date = datetime.now()
+    growth = 0.01 * np.arange(30)
+    eth_prices = (tokens["ETH"] * (1 + growth * _RNG.uniform(0.8, 1.2, size=30))).round(2).tolist()
+    btc_prices = (tokens["BTC"] * (1 + growth * _RNG.uniform(0.8, 1.2, size=30))).round(2).tolist()
     
-    for i in range(30):
-        date_point = current_date + timedelta(days=i)
-        forecast_data.append({
-            "date": date_point.strftime("%Y-%m-%d"),
-            "eth_price": round(tokens["ETH"] * (1 + 0.01 * i * random.uniform(0.8, 1.2)), 2),
-            "btc_price": round(tokens["BTC"] * (1 + 0.01 * i * random.uniform(0.8, 1.2)), 2)
-        })
+    forecast_data = [
+        {
+            "date": date_point,
+            "eth_price": eth_price,
+            "btc_price": btc_price
+        }
+        for date_point, eth_price, btc_price in zip(_dates(np.arange(30)), eth_prices, btc_prices)
+    ]
     
     # If we have a request text, try to generate relevant content
     if request_text:
         try:
-            llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.3)
-            prediction_prompt = ChatPromptTemplate.from_template(
-                """You are a price prediction service for cryptocurrency markets.
-                Based on this request, generate a market forecast and analysis:
-                
-                Request: {request_text}
-                Service: {service_name}
-                
-                Format your response as a JSON object with these sections:
-                - title: A descriptive title for the forecast
-                - summary: A concise overview of the forecast (3-4 sentences)
-                - market_sentiment: Overall market sentiment (bullish, bearish, or neutral) with explanation
-                - key_indicators: Array of 3-4 technical indicators supporting the forecast
-                - catalysts: Array of 3-4 potential market catalysts that could impact prices
-                - recommendations: Array of 2-3 strategic recommendations
-                
-                All sections should be specific to the request provided.
-                """
-            )
-            
-            prediction_chain = prediction_prompt | llm | JsonOutputParser()
-            result = prediction_chain.invoke({
+            result = await _cached_ainvoke("prediction", {
                 "request_text": request_text,
                 "service_name": service_name
             })
@@ -160,37 +471,53 @@ def generate_prediction_result(service_name, request_text=""):
             
             return result
         except Exception as e:
-            print(f"Error generating prediction content: {str(e)}")
+            logger.error("Error generating prediction content: %s", e)
             # Fall through to default
     
     # Default prediction result if no request text or if generation fails
     return {
+        **_DEFAULT_PREDICTION_RESULT,
         "title": f"{service_name} Market Forecast",
-        "summary": "Forecast of cryptocurrency price movements based on technical and fundamental analysis.",
         "predictions": predictions,
         "forecast_data": forecast_data,
         "market_sentiment": {
             "overall": random.choice(["Bullish", "Neutral", "Slightly Bullish", "Slightly Bearish"]),
             "explanation": "Market indicators suggest cautious optimism with momentum building in major assets."
-        },
-        "key_indicators": [
-            "Moving Average Convergence Divergence (MACD) showing positive momentum",
-            "Relative Strength Index (RSI) in neutral territory with room for growth",
-            "Support levels holding firm across major assets"
-        ],
-        "catalysts": [
-            "Upcoming protocol upgrades for Ethereum",
-            "Institutional adoption continuing to increase",
-            "Regulatory developments in key markets"
-        ],
-        "recommendations": [
-            "Consider dollar-cost averaging into major assets",
-            "Set stop-losses to protect against market volatility",
-            "Monitor on-chain metrics for early signs of trend changes"
-        ]
+        }
     }
 
-def generate_token_result(service_name, request_text=""):
+def generate_prediction_result(service_name, request_text=""):
+    """Generate mock prediction results based on the request text"""
+    return run_async(agenerate_prediction_result(service_name, request_text))
+
+# Constant part of the default token analysis result
+_DEFAULT_TOKEN_RESULT = MappingProxyType({
+    "title": None,
+    "summary": None,
+    "token_data": None,
+    "price_history": None,
+    "strengths": [
+        "Strong development team with consistent delivery",
+        "Growing ecosystem and partnerships",
+        "Solid tokenomics with deflationary mechanism",
+        "High security rating from multiple audit firms"
+    ],
+    "weaknesses": [
+        "Increasing competition in the same market segment",
+        "Regulatory uncertainty in key markets",
+        "Concentration of tokens among few large holders"
+    ],
+    "technical_indicators": None,
+    "fundamental_factors": [
+        "Upcoming protocol upgrade scheduled for next quarter",
+        "Increasing institutional interest and adoption",
+        "Growing TVL across protocol's applications",
+        "Expansion into additional blockchain networks"
+    ],
+    "investment_outlook": None
+})
+
+async def agenerate_token_result(service_name, request_text=""):
     """Generate mock token analysis results based on the request text"""
     # Create token analysis data
     token_data = {
@@ -205,47 +532,26 @@ def generate_token_result(service_name, request_text=""):
     }
     
     # Create price history data
-    price_history = []
-    current_date = datetime.now()
     base_price = token_data["price"] * 0.7  # Start at 70% of current price
     
-    for i in range(90):
-        date_point = current_date - timedelta(days=90-i)
-        daily_change = random.uniform(-0.05, 0.05)
-        base_price = base_price * (1 + daily_change)
-        
-        price_history.append({
-            "date": date_point.strftime("%Y-%m-%d"),
-            "price": round(base_price, 2),
-            "volume": round(random.uniform(token_data["price"] * 1000000, token_data["price"] * 10000000), 0)
-        })
+    # Compound the daily changes into a random walk in one pass
+    daily_changes = _RNG.uniform(-0.05, 0.05, size=90)
+    prices = (base_price * np.cumprod(1 + daily_changes)).round(2).tolist()
+    volumes = _RNG.uniform(token_data["price"] * 1000000, token_data["price"] * 10000000, size=90).round().tolist()
+    
+    price_history = [
+        {
+            "date": date_point,
+            "price": price,
+            "volume": volume
+        }
+        for date_point, price, volume in zip(_dates(np.arange(-90, 0)), prices, volumes)
+    ]
     
     # If we have a request text, try to generate relevant content
     if request_text:
         try:
-            llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.3)
-            token_prompt = ChatPromptTemplate.from_template(
-                """You are a token analysis service providing insights on cryptocurrencies.
-                Based on this request, generate a token analysis:
-                
-                Request: {request_text}
-                Service: {service_name}
-                
-                Format your response as a JSON object with these sections:
-                - title: A descriptive title for the token analysis
-                - summary: A concise overview of the token (3-4 sentences)
-                - strengths: Array of 3-4 strengths of the token/project
-                - weaknesses: Array of 2-3 weaknesses or concerns
-                - technical_indicators: Object with 3-4 technical indicators and their values
-                - fundamental_factors: Array of 3-4 fundamental factors affecting the token
-                - investment_outlook: Short, medium, and long-term outlook
-                
-                All sections should be specific to the request provided.
-                """
-            )
-            
-            token_chain = token_prompt | llm | JsonOutputParser()
-            result = token_chain.invoke({
+            result = await _cached_ainvoke("token", {
                 "request_text": request_text,
                 "service_name": service_name
             })
@@ -256,38 +562,22 @@ def generate_token_result(service_name, request_text=""):
             
             return result
         except Exception as e:
-            print(f"Error generating token analysis content: {str(e)}")
+            logger.error("Error generating token analysis content: %s", e)
             # Fall through to default
     
     # Default token result if no request text or if generation fails
     return {
+        **_DEFAULT_TOKEN_RESULT,
         "title": f"{token_data['name']} Token Analysis",
         "summary": f"Comprehensive analysis of {token_data['name']} token fundamentals, technicals, and market positioning.",
         "token_data": token_data,
         "price_history": price_history,
-        "strengths": [
-            "Strong development team with consistent delivery",
-            "Growing ecosystem and partnerships",
-            "Solid tokenomics with deflationary mechanism",
-            "High security rating from multiple audit firms"
-        ],
-        "weaknesses": [
-            "Increasing competition in the same market segment",
-            "Regulatory uncertainty in key markets",
-            "Concentration of tokens among few large holders"
-        ],
         "technical_indicators": {
             "RSI": round(random.uniform(30, 70), 1),
             "MACD": "Bullish crossover forming",
             "Moving Averages": "Trading above 50-day MA, approaching 200-day MA",
             "Bollinger Bands": "Contracting, suggesting decreased volatility"
         },
-        "fundamental_factors": [
-            "Upcoming protocol upgrade scheduled for next quarter",
-            "Increasing institutional interest and adoption",
-            "Growing TVL across protocol's applications",
-            "Expansion into additional blockchain networks"
-        ],
         "investment_outlook": {
             "short_term": random.choice(["Neutral", "Slightly Bullish", "Bullish", "Slightly Bearish"]),
             "mid_term": random.choice(["Neutral", "Bullish", "Very Bullish"]),
@@ -295,16 +585,15 @@ def generate_token_result(service_name, request_text=""):
         }
     }
 
-def generate_data_feed_result(service_name, request_text=""):
-    """Generate mock data feed results based on the request text"""
-    # Define popular tokens and their recent price ranges
-    tokens = {
-        "ETH": {"min": 1500, "max": 3500, "decimals": 2},
-        "BTC": {"min": 25000, "max": 65000, "decimals": 2},
-        "MATIC": {"min": 0.5, "max": 1.5, "decimals": 4},
-        "AAVE": {"min": 50, "max": 200, "decimals": 2},
-        "UNI": {"min": 3, "max": 8, "decimals": 3}
-    }
+def generate_token_result(service_name, request_text=""):
+    """Generate mock token analysis results based on the request text"""
+    return run_async(agenerate_token_result(service_name, request_text))
+
+def _select_feed(request_text) -> Tuple[List[str], str]:
+    """Pick the tokens and feed type of a data feed request"""
+    # Collect the feed keywords mentioned in the request
+    terms = {match.group(0).lower() for match in _FEED_TERMS.finditer(request_text or "")}
+    tickers = {_FEED_TOKEN_ALIASES.get(term, term) for term in terms}
     
     # Determine what tokens to use based on request text
     selected_tokens = []
@@ -313,21 +602,16 @@ def generate_data_feed_result(service_name, request_text=""):
         # Default selection
         selected_tokens = ["ETH", "BTC", "AAVE", "UNI"]
     else:
-        request_lower = request_text.lower()
         # Check for specific tokens in the request
-        for token in tokens.keys():
-            if token.lower() in request_lower:
+        for token in _FEED_TOKENS.keys():
+            if token.lower() in tickers:
                 selected_tokens.append(token)
         
         # Add major tokens by default
-        if "bitcoin" in request_lower or "btc" in request_lower:
+        if "bitcoin" in terms:
             if "BTC" not in selected_tokens:
                 selected_tokens.append("BTC")
         
-        if "ethereum" in request_lower or "eth" in request_lower:
-            if "ETH" not in selected_tokens:
-                selected_tokens.append("ETH")
-        
         # Ensure we have at least 3 tokens
         if len(selected_tokens) < 3:
             remaining = ["ETH", "BTC", "AAVE", "UNI"]
@@ -338,13 +622,30 @@ def generate_data_feed_result(service_name, request_text=""):
                         break
     
     # Determine feed type based on request
-    feed_type = "price"
-    if request_text and any(term in request_text.lower() for term in ["volume", "liquidity", "trading"]):
-        feed_type = "market"
-    elif request_text and any(term in request_text.lower() for term in ["yield", "apr", "apy", "interest"]):
-        feed_type = "yield"
-    elif request_text and any(term in request_text.lower() for term in ["gas", "fee", "transaction"]):
-        feed_type = "gas"
+    feed_type = next(
+        (candidate for candidate, candidate_terms in _FEED_TYPE_TERMS if not candidate_terms.isdisjoint(terms)),
+        "price"
+    )
+    
+    return selected_tokens, feed_type
+
+# Constant part of the default data feed result
+_DEFAULT_DATA_FEED_RESULT = MappingProxyType({
+    "title": None,
+    "description": None,
+    "last_updated": None,
+    "update_frequency": "5 minutes",
+    "feed_items": None,
+    "data_quality_score": None,
+    "source": "DeFi Llama Data Feed",
+    "data_source": "DeFi Llama API",
+    "recommendation": None
+})
+
+async def agenerate_data_feed_result(service_name, request_text=""):
+    """Generate mock data feed results based on the request text"""
+    selected_tokens, feed_type = _select_feed(request_text)
+    tokens = _FEED_TOKENS
     
     # Generate feed title and description based on type
     if feed_type == "price":
@@ -364,14 +665,11 @@ def generate_data_feed_result(service_name, request_text=""):
     feed_items = []
     
     if feed_type == "price" or feed_type == "market":
-        # Generate price/market data for selected tokens
-        for token in selected_tokens:
-            token_config = tokens[token]
-            base_price = random.uniform(token_config["min"], token_config["max"])
-            
-            # Generate several time points
-            for i in range(3):
-                timestamp = datetime.now() - timedelta(minutes=i*15)
+        # Generate price/market data for selected tokens, newest time point first
+        base_prices = [random.uniform(tokens[token]["min"], tokens[token]["max"]) for token in selected_tokens]
+        for timestamp in _timestamps(np.arange(3) * 15):
+            for token, base_price in zip(selected_tokens, base_prices):
+                token_config = tokens[token]
                 
                 # Add slight variations for each time point
                 price_variation = base_price * random.uniform(-0.02, 0.02)
@@ -379,7 +677,7 @@ def generate_data_feed_result(service_name, request_text=""):
                 
                 # Create data point
                 data_point = {
-                    "timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                    "timestamp": timestamp,
                     "token": token,
                     "price": current_price,
                     "change_24h": f"{random.uniform(-5, 5):.2f}%"
@@ -400,72 +698,60 @@ def generate_data_feed_result(service_name, request_text=""):
         protocols = ["Aave", "Compound", "Curve", "Uniswap", "MakerDAO", "Lido", "Convex"]
         assets = ["ETH", "BTC", "USDC", "DAI", "USDT"]
         
-        for protocol in protocols[:4]:  # Take first 4 protocols
-            for asset in assets[:3]:  # Take first 3 assets
-                timestamp = datetime.now() - timedelta(minutes=random.randint(5, 60))
-                
-                feed_items.append({
-                    "timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                    "protocol": protocol,
-                    "asset": asset,
-                    "apy": f"{random.uniform(0.5, 15):.2f}%",
-                    "tvl": f"${random.uniform(10, 500):.2f}M",
-                    "strategy": random.choice(["Lending", "Staking", "Liquidity Mining"])
-                })
+        pairs = [(protocol, asset) for protocol in protocols[:4] for asset in assets[:3]]  # First 4 protocols, first 3 assets
+        minutes_ago = _RNG.integers(5, 60, size=len(pairs), endpoint=True)
+        timestamps = _timestamps(minutes_ago)
+        apys = _format("%.2f%%", _RNG.uniform(0.5, 15, size=len(pairs)))
+        tvls = _format("$%.2fM", _RNG.uniform(10, 500, size=len(pairs)))
+        
+        # Visit the pairs from the most recent update so the feed comes out newest first
+        for index in np.argsort(minutes_ago, kind="stable").tolist():
+            protocol, asset = pairs[index]
+            feed_items.append({
+                "timestamp": timestamps[index],
+                "protocol": protocol,
+                "asset": asset,
+                "apy": apys[index],
+                "tvl": tvls[index],
+                "strategy": random.choice(["Lending", "Staking", "Liquidity Mining"])
+            })
                 
     elif feed_type == "gas":
-        # Generate gas price data
-        for i in range(10):
-            timestamp = datetime.now() - timedelta(minutes=i*6)
-            base_gwei = random.randint(20, 80)
-            
+        # Generate gas price data, formatting each column at once
+        base_fees = _format("%d gwei", _RNG.integers(20, 80, size=10, endpoint=True))
+        slow_fees = _format("%d gwei", _RNG.integers(1, 3, size=10, endpoint=True))
+        standard_fees = _format("%d gwei", _RNG.integers(2, 5, size=10, endpoint=True))
+        fast_fees = _format("%d gwei", _RNG.integers(5, 10, size=10, endpoint=True))
+        slow_waits = _format("%d mins", _RNG.integers(3, 10, size=10, endpoint=True))
+        standard_waits = _format("%d mins", _RNG.integers(1, 3, size=10, endpoint=True))
+        
+        for i, timestamp in enumerate(_timestamps(np.arange(10) * 6)):
             feed_items.append({
-                "timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                "timestamp": timestamp,
                 "network": "Ethereum",
-                "base_fee": f"{base_gwei} gwei",
+                "base_fee": base_fees[i],
                 "priority_fee": {
-                    "slow": f"{random.randint(1, 3)} gwei",
-                    "standard": f"{random.randint(2, 5)} gwei",
-                    "fast": f"{random.randint(5, 10)} gwei"
+                    "slow": slow_fees[i],
+                    "standard": standard_fees[i],
+                    "fast": fast_fees[i]
                 },
                 "estimated_confirmation": {
-                    "slow": f"{random.randint(3, 10)} mins",
-                    "standard": f"{random.randint(1, 3)} mins",
+                    "slow": slow_waits[i],
+                    "standard": standard_waits[i],
                     "fast": "< 1 min"
                 },
                 "block_number": 17000000 + i*5
             })
     
-    # Sort by timestamp (newest first)
-    feed_items = sorted(feed_items, key=lambda x: x["timestamp"], reverse=True)
-    
     # If we have a request text, try to generate relevant content
     if request_text:
         try:
-            llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.3)
-            feed_prompt = ChatPromptTemplate.from_template(
-                """You are a DeFi data feed service. Generate details for a data feed based on this request:
-                
-                Request: {request_text}
-                Feed Type: {feed_type}
-                Selected Tokens: {tokens}
-                
-                Respond with a JSON object containing:
-                - title: A title for the data feed
-                - description: A detailed description of what data is being provided
-                - source: The name of a realistic DeFi data aggregator (like "DeFi Pulse Analytics")
-                - update_frequency: How often the data is updated (e.g., "5 minutes", "hourly")
-                - data_quality_score: A quality score between 0.85 and 0.99
-                - recommendation: A brief analysis of the data (2-3 sentences)
-                """
-            )
-            
-            feed_chain = feed_prompt | llm | JsonOutputParser()
-            feed_result = feed_chain.invoke({
+            payload = {
                 "request_text": request_text,
                 "feed_type": feed_type,
                 "tokens": ", ".join(selected_tokens)
-            })
+            }
+            feed_result = await _cached_ainvoke("data_feed", payload, ttl=answer_ttl("data_feed", payload))
             
             # Merge the generated content with our feed items
             feed_result["feed_items"] = feed_items
@@ -473,33 +759,68 @@ def generate_data_feed_result(service_name, request_text=""):
             feed_result["data_source"] = "DeFi Llama API"
             return feed_result
         except Exception as e:
-            print(f"Error generating feed content: {str(e)}")
+            logger.error("Error generating feed content: %s", e)
             # Fallback to default if generation fails
             pass
             
     # Default response if no request text or if generation fails
     return {
+        **_DEFAULT_DATA_FEED_RESULT,
         "title": title,
         "description": description,
         "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "update_frequency": "5 minutes",
         "feed_items": feed_items,
         "data_quality_score": round(random.uniform(0.85, 0.99), 2),
-        "source": "DeFi Llama Data Feed",
-        "data_source": "DeFi Llama API",
         "recommendation": f"Based on current data trends, consider monitoring {selected_tokens[0]} and {selected_tokens[1]} for potential opportunities."
     }
 
-def generate_optimization_result(service_name, request_text=""):
+def generate_data_feed_result(service_name, request_text=""):
+    """Generate mock data feed results based on the request text"""
+    return run_async(agenerate_data_feed_result(service_name, request_text))
+
+# Constant part of the default optimization result
+_DEFAULT_OPTIMIZATION_RESULT = MappingProxyType({
+    "title": None,
+    "summary": "Analysis of current yield strategies with optimization recommendations to maximize returns while managing risk.",
+    "scenarios": None,
+    "current_strategy": "Basic single-protocol deposit strategy with standard parameters and manual rebalancing.",
+    "optimized_strategy": "Multi-protocol strategy utilizing optimal asset allocation, automated rebalancing, and leveraging governance token incentives.",
+    "benefits": [
+        "Increase in overall APY by 20-30% compared to standard approaches",
+        "Reduced impermanent loss through dynamic position management",
+        "Better risk distribution across multiple protocols",
+        "Potential for additional governance token rewards"
+    ],
+    "considerations": [
+        "Higher gas costs due to more frequent transactions",
+        "Increased complexity requiring monitoring tools",
+        "Smart contract risk spread across multiple protocols"
+    ],
+    "implementation_steps": [
+        "Audit current positions and calculate baseline performance",
+        "Set up wallets and establish positions in recommended protocols",
+        "Configure automation tools for rebalancing and harvesting",
+        "Monitor performance and adjust parameters as needed",
+        "Periodically review strategy against market conditions"
+    ],
+    "recommended_scenario": None,
+    "estimated_annual_savings": None,
+    "implementation_notes": "Implementation can begin immediately after approval. Expected completion within 2-4 weeks."
+})
+
+async def agenerate_optimization_result(service_name, request_text=""):
     """Generate mock optimization results based on the request text"""
     # Create optimization scenarios
     scenarios = []
+    current_apys = _RNG.uniform(1, 8, size=3).round(2)
+    optimized_apys = (current_apys * _RNG.uniform(1.1, 1.6, size=3)).round(2)
+    capital_required = _RNG.integers(500, 10000, size=3, endpoint=True).tolist()
+    current_costs = _RNG.integers(100, 500, size=3, endpoint=True).tolist()
+    optimized_costs = _RNG.integers(50, 90, size=3, endpoint=True).tolist()
     
-    for i in range(3):
+    for i, (current_apy, optimized_apy) in enumerate(zip(current_apys.tolist(), optimized_apys.tolist())):
         protocol_name = random.choice(["Aave", "Compound", "Uniswap", "Curve", "Balancer"])
         asset_type = random.choice(["Lending", "Staking", "Liquidity Provision"])
-        current_apy = round(random.uniform(1, 8), 2)
-        optimized_apy = round(current_apy * random.uniform(1.1, 1.6), 2)
         
         scenario = {
             "name": f"Scenario {i+1}: {protocol_name} {asset_type} Optimization",
@@ -511,9 +832,9 @@ def generate_optimization_result(service_name, request_text=""):
             "risk_level": random.choice(["Low", "Medium", "Medium-Low", "Medium-High"]),
             "complexity": random.choice(["Simple", "Moderate", "Complex"]),
             "timeframe": random.choice(["Short-term", "Medium-term", "Long-term"]),
-            "capital_required": f"${random.randint(500, 10000)}",
-            "current_cost": random.randint(100, 500),
-            "optimized_cost": random.randint(50, 90)
+            "capital_required": f"${capital_required[i]}",
+            "current_cost": current_costs[i],
+            "optimized_cost": optimized_costs[i]
         }
         
         scenarios.append(scenario)
@@ -524,29 +845,7 @@ def generate_optimization_result(service_name, request_text=""):
     # If we have a request text, try to generate relevant content
     if request_text:
         try:
-            llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.3)
-            optimization_prompt = ChatPromptTemplate.from_template(
-                """You are a DeFi optimization service suggesting improvements to yield strategies.
-                Based on this request, generate optimization recommendations:
-                
-                Request: {request_text}
-                Service: {service_name}
-                
-                Format your response as a JSON object with these sections:
-                - title: A descriptive title for the optimization recommendation
-                - summary: A concise overview of the optimization strategy (3-4 sentences)
-                - current_strategy: Description of typical current approach
-                - optimized_strategy: Detailed explanation of the recommended optimized approach
-                - benefits: Array of 3-4 specific benefits
-                - considerations: Array of 2-3 important considerations or risks
-                - implementation_steps: Array of 4-5 steps to implement the optimization
-                
-                All sections should be specific to the request provided.
-                """
-            )
-            
-            optimization_chain = optimization_prompt | llm | JsonOutputParser()
-            result = optimization_chain.invoke({
+            result = await _cached_ainvoke("optimization", {
                 "request_text": request_text,
                 "service_name": service_name
             })
@@ -556,35 +855,69 @@ def generate_optimization_result(service_name, request_text=""):
             
             return result
         except Exception as e:
-            print(f"Error generating optimization content: {str(e)}")
+            logger.error("Error generating optimization content: %s", e)
             # Fall through to default
     
     # Default optimization result if no request text or if generation fails
     return {
+        **_DEFAULT_OPTIMIZATION_RESULT,
         "title": f"{service_name} Yield Optimization",
-        "summary": "Analysis of current yield strategies with optimization recommendations to maximize returns while managing risk.",
         "scenarios": scenarios,
-        "current_strategy": "Basic single-protocol deposit strategy with standard parameters and manual rebalancing.",
-        "optimized_strategy": "Multi-protocol strategy utilizing optimal asset allocation, automated rebalancing, and leveraging governance token incentives.",
-        "benefits": [
-            "Increase in overall APY by 20-30% compared to standard approaches",
-            "Reduced impermanent loss through dynamic position management",
-            "Better risk distribution across multiple protocols",
-            "Potential for additional governance token rewards"
-        ],
-        "considerations": [
-            "Higher gas costs due to more frequent transactions",
-            "Increased complexity requiring monitoring tools",
-            "Smart contract risk spread across multiple protocols"
-        ],
-        "implementation_steps": [
-            "Audit current positions and calculate baseline performance",
-            "Set up wallets and establish positions in recommended protocols",
-            "Configure automation tools for rebalancing and harvesting",
-            "Monitor performance and adjust parameters as needed",
-            "Periodically review strategy against market conditions"
-        ],
         "recommended_scenario": scenarios[0]["name"],
-        "estimated_annual_savings": f"${round(scenarios[0]['original_cost'] - scenarios[0]['optimized_cost'], 2) * 12}",
-        "implementation_notes": "Implementation can begin immediately after approval. Expected completion within 2-4 weeks."
-    } 
\ No newline at end of file
+        "estimated_annual_savings": f"${round(scenarios[0]['current_cost'] - scenarios[0]['optimized_cost'], 2) * 12}"
+    }
+
+def generate_optimization_result(service_name, request_text=""):
+    """Generate mock optimization results based on the request text"""
+    return run_async(agenerate_optimization_result(service_name, request_text))
+
+def build_payload(result_type, service_name, request_text=""):
+    """Chain input the generator of a result type sends for a request"""
+    if result_type == "data_feed":
+        selected_tokens, feed_type = _select_feed(request_text)
+        return {
+            "request_text": request_text,
+            "feed_type": feed_type,
+            "tokens": ", ".join(selected_tokens)
+        }
+    return {
+        "request_text": request_text,
+        "service_name": service_name
+    }
+
+def prepare_batch_entry(request_id, result_type, service_name, request_text=""):
+    """Batch API request line of the LLM call a generator makes for a request"""
+    messages = _PROMPTS[result_type].format_messages(**build_payload(result_type, service_name, request_text))
+    return {
+        "custom_id": request_id,
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": {
+            "model": _MODEL,
+            "temperature": _TEMPERATURE,
+            "messages": [
+                {"role": _OPENAI_ROLES[message.type], "content": message.content}
+                for message in messages
+            ]
+        }
+    }
+
+# Async generators by result type, anything else is generated as analytics
+_ASYNC_GENERATORS = {
+    "analytics": agenerate_analytics_result,
+    "prediction": agenerate_prediction_result,
+    "token": agenerate_token_result,
+    "data_feed": agenerate_data_feed_result,
+    "optimization": agenerate_optimization_result
+}
+
+async def agenerate_results(jobs: List[Tuple[str, str]], request_text=""):
+    """Generate the results of several (result_type, service_name) jobs concurrently"""
+    return await asyncio.gather(*(
+        _ASYNC_GENERATORS.get(result_type, agenerate_analytics_result)(service_name, request_text)
+        for result_type, service_name in jobs
+    ))
+
+def generate_results(jobs: List[Tuple[str, str]], request_text=""):
+    """Generate the results of several (result_type, service_name) jobs, in job order"""
+    return run_async(agenerate_results(jobs, request_text))
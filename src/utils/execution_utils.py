@@ -2,7 +2,10 @@
 import random
 import json
 import copy
+import functools
+import secrets
 import traceback
+from types import MappingProxyType
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union
 from langchain.prompts import ChatPromptTemplate
@@ -40,22 +43,25 @@ def deep_copy_request(request):
 
 def generate_random_transaction_id():
     """Generate a random transaction hash that looks like a Gnosis Chain tx"""
-    return f"0x{''.join(random.choices('0123456789abcdef', k=64))}"
+    return f"0x{secrets.token_hex(32)}"
+
+# Names of the known services, used when no name map is provided
+_DEFAULT_SERVICE_NAMES = MappingProxyType({
+    "1722": "DeFi Analytics Service",
+    "1815": "Token Price Analysis Service", 
+    "1966": "AI Task Execution Service",
+    "1961": "AI Task Execution Service",
+    "1983": "AI Task Processing Mech",
+    "1993": "Task Execution Mech Service",
+    "1999": "Yield Farming Optimizer",
+    "2010": "Nevermined Subscription Mech"
+})
 
 def get_service_name(service_id, services_map=None, service_name_map=None):
     """Get the name of a service from its ID"""
-    # Define default service name map if not provided
+    # Use the default service name map if not provided
     if service_name_map is None:
-        service_name_map = {
-            "1722": "DeFi Analytics Service",
-            "1815": "Token Price Analysis Service", 
-            "1966": "AI Task Execution Service",
-            "1961": "AI Task Execution Service",
-            "1983": "AI Task Processing Mech",
-            "1993": "Task Execution Mech Service",
-            "1999": "Yield Farming Optimizer",
-            "2010": "Nevermined Subscription Mech"
-        }
+        service_name_map = _DEFAULT_SERVICE_NAMES
     
     # Handle the case where service_id is None or empty
     if not service_id:
@@ -168,16 +174,20 @@ def generate_pipeline_steps(service_ids, request_text=""):
         print(f"Error in generate_pipeline_steps: {str(e)}")
         return generate_fallback_steps(service_ids)
 
+# Pipeline shown when no service IDs are provided
+_DEFAULT_PIPELINE_STEPS = (
+    {"name": "Request Initialization", "description": "Processing initial request parameters", "status": "complete", "duration": "2 seconds"},
+    {"name": "Service Selection", "description": "Determining appropriate services for the request", "status": "complete", "duration": "3 seconds"},
+    {"name": "Data Collection", "description": "Gathering relevant DeFi market data from trusted sources", "status": "in_progress", "duration": "5 seconds"},
+    {"name": "Market Analysis", "description": "Processing gathered market data to identify key trends and patterns", "status": "pending", "duration": "7 seconds"},
+    {"name": "Strategy Formulation", "description": "Developing investment strategies based on market analysis", "status": "pending", "duration": "6 seconds"},
+    {"name": "Report Generation", "description": "Compiling analysis and recommendations into a comprehensive report", "status": "pending", "duration": "4 seconds"}
+)
+
 def get_default_pipeline_steps():
     """Generate default pipeline steps when no service IDs are provided"""
-    return [
-        {"name": "Request Initialization", "description": "Processing initial request parameters", "status": "complete", "duration": "2 seconds"},
-        {"name": "Service Selection", "description": "Determining appropriate services for the request", "status": "complete", "duration": "3 seconds"},
-        {"name": "Data Collection", "description": "Gathering relevant DeFi market data from trusted sources", "status": "in_progress", "duration": "5 seconds"},
-        {"name": "Market Analysis", "description": "Processing gathered market data to identify key trends and patterns", "status": "pending", "duration": "7 seconds"},
-        {"name": "Strategy Formulation", "description": "Developing investment strategies based on market analysis", "status": "pending", "duration": "6 seconds"},
-        {"name": "Report Generation", "description": "Compiling analysis and recommendations into a comprehensive report", "status": "pending", "duration": "4 seconds"}
-    ]
+    # Callers update the step statuses, so hand out copies of the constant
+    return [dict(step) for step in _DEFAULT_PIPELINE_STEPS]
 
 def generate_fallback_steps(service_ids):
     """Generate fallback pipeline steps based on service IDs"""
@@ -240,8 +250,10 @@ def generate_fallback_steps(service_ids):
     
     return steps
 
+@functools.lru_cache(maxsize=256)
 def determine_result_type(service_name, default_type):
     """Determine the most appropriate result type based on service name"""
+    # Service names come from a small fixed set, so results are memoized
     service_name_lower = service_name.lower()
     
     if any(keyword in service_name_lower for keyword in ["analytics", "analysis", "insight"]):
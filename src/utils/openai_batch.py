@@ -0,0 +1,98 @@
+"""OpenAI Batch API driver for generating results outside interactive requests.
+
+Batch requests cost half as much as direct calls and absorb many prompts in a
+single submission, at the price of completing within 24 hours. Use them for
+background work such as refreshing default dashboards, not for user requests.
+"""
+import json
+import time
+import logging
+import functools
+from typing import Dict, Iterable, List, Tuple
+from openai import OpenAI
+from langchain_core.output_parsers import JsonOutputParser
+from src.utils.data_generators import answer_ttl, build_payload, cache_answer, generate_results, prepare_batch_entry
+
+logger = logging.getLogger(__name__)
+
+# Batch states after which polling stops
+_TERMINAL_STATUSES = frozenset(("completed", "failed", "expired", "cancelled"))
+
+@functools.lru_cache(maxsize=None)
+def _client():
+    """OpenAI client, created on first use so importing this module doesn't require an API key"""
+    return OpenAI()
+
+def submit_batch(entries: Iterable[dict]) -> str:
+    """Upload batch entries as JSONL and start a batch, returning its ID"""
+    jsonl = "\n".join(json.dumps(entry) for entry in entries).encode("utf-8")
+    batch_file = _client().files.create(file=("batch.jsonl", jsonl), purpose="batch")
+    batch = _client().batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    logger.info("Submitted batch %s", batch.id)
+    return batch.id
+
+def poll(batch_id: str, interval: float = 60.0):
+    """Wait for a batch to reach a terminal status and return it"""
+    batch = _client().batches.retrieve(batch_id)
+    while batch.status not in _TERMINAL_STATUSES:
+        time.sleep(interval)
+        batch = _client().batches.retrieve(batch_id)
+    return batch
+
+def finalize(batch_id: str, jobs: Dict[str, Tuple[str, str, str]]) -> Dict[str, dict]:
+    """Turn the answers of a completed batch into generator results.
+
+    jobs maps each custom_id to its (result_type, service_name, request_text).
+    Each answer is cached for its request, then the generator of its result type
+    is run, so the local random data is attached the same way as for a live
+    call. Failed and unknown requests are logged and left out of the results.
+    """
+    batch = _client().batches.retrieve(batch_id)
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch_id} is {batch.status}, not completed")
+
+    parser = JsonOutputParser()
+    results = {}
+    output = _client().files.content(batch.output_file_id).text if batch.output_file_id else ""
+    for line in output.splitlines():
+        record = json.loads(line)
+        custom_id = record["custom_id"]
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            logger.warning("Batch request %s failed: %s", custom_id, record.get("error") or response.get("body"))
+            continue
+
+        job = jobs.get(custom_id)
+        if job is None:
+            logger.warning("Skipping batch request %s, it is not one of the jobs", custom_id)
+            continue
+        result_type, service_name, request_text = job
+        try:
+            answer = parser.parse(response["body"]["choices"][0]["message"]["content"])
+        except Exception as e:
+            logger.warning("Could not parse the answer of batch request %s: %s", custom_id, e)
+            continue
+        # Cache for as long as a live answer would be, gas feeds go stale sooner
+        payload = build_payload(result_type, service_name, request_text)
+        cache_answer(result_type, payload, answer, answer_ttl(result_type, payload))
+        results[custom_id] = generate_results([(result_type, service_name)], request_text)[0]
+
+    if batch.error_file_id:
+        logger.warning("Batch %s has failed requests, see file %s", batch_id, batch.error_file_id)
+    return results
+
+def run_batch(jobs: List[Tuple[str, str, str]], interval: float = 60.0) -> Dict[str, dict]:
+    """Generate results for (result_type, service_name, request_text) jobs in one
+    batch, blocking until it completes. Results are keyed by the job index as a string"""
+    jobs_by_id = {str(index): job for index, job in enumerate(jobs)}
+    batch_id = submit_batch(
+        prepare_batch_entry(custom_id, *job) for custom_id, job in jobs_by_id.items()
+    )
+    batch = poll(batch_id, interval)
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch_id} ended as {batch.status}")
+    return finalize(batch_id, jobs_by_id)
@@ -40,5 +40,5 @@ class PrivyAPI:
             response.raise_for_status()
             return response.json()
         except requests.RequestException as e:
-            logger.error(f"Privy API request failed: {e}")
+            logger.error("Privy API request failed: %s", e)
             return {"error": str(e)}
@@ -25,19 +25,19 @@ class SupabaseClient:
                 project_id = match.group(1)
                 # Construct the Supabase URL in the correct format
                 supabase_url = f"https://{project_id}.supabase.co"
-                logger.info(f"Using Supabase URL: {supabase_url}")
+                logger.info("Using Supabase URL: %s", supabase_url)
             else:
                 # If the URL is already in the correct format, use it as is
                 if not supabase_url.startswith("https://"):
                     supabase_url = f"https://{supabase_url}"
-                logger.info(f"Using provided Supabase URL: {supabase_url}")
+                logger.info("Using provided Supabase URL: %s", supabase_url)
             
             self.client: Client = create_client(supabase_url, supabase_key)
             # Test the connection
             self.client.table('users').select('count').limit(1).execute()
             logger.info("Successfully connected to Supabase")
         except Exception as e:
-            logger.error(f"Failed to initialize Supabase client: {e}")
+            logger.error("Failed to initialize Supabase client: %s", e)
             raise ValueError(f"Failed to connect to Supabase: {e}")
     
     def create_or_get_user(self, privy_user_id: str, email: str, wallet_address: str) -> Dict[str, Any]:
@@ -76,7 +76,7 @@ class SupabaseClient:
                 raise Exception("Failed to create user")
                 
         except Exception as e:
-            logger.error(f"Error in create_or_get_user: {e}")
+            logger.error("Error in create_or_get_user: %s", e)
             raise
     
     def get_user_by_wallet(self, wallet_address: str) -> Optional[Dict[str, Any]]:
@@ -97,7 +97,7 @@ class SupabaseClient:
             return None
             
         except Exception as e:
-            logger.error(f"Error in get_user_by_wallet: {e}")
+            logger.error("Error in get_user_by_wallet: %s", e)
             return None
     
     def update_user_wallet(self, privy_user_id: str, wallet_address: str) -> Optional[Dict[str, Any]]:
@@ -122,5 +122,5 @@ class SupabaseClient:
             return None
             
         except Exception as e:
-            logger.error(f"Error in update_user_wallet: {e}")
+            logger.error("Error in update_user_wallet: %s", e)
             return None 
\ No newline at end of file
@@ -7,6 +7,12 @@ from typing import List, Dict, Any, Optional
 import uuid
 from models import Transaction, TransactionState, Tool, ExecutionStep
 
+# Parse the transactions file with orjson when it is available
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -21,12 +27,13 @@ os.makedirs(DATA_DIR, exist_ok=True)
 def _load_transactions() -> Dict[str, Dict[str, Any]]:
     """Load transactions from the JSON file."""
     try:
-        if os.path.exists(TRANSACTIONS_FILE):
-            with open(TRANSACTIONS_FILE, "r") as f:
-                return json.load(f)
+        # Read bytes, both parsers accept them and the text decode is skipped
+        with open(TRANSACTIONS_FILE, "rb") as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
         return {}
     except Exception as e:
-        logger.error(f"Error loading transactions: {e}")
+        logger.error("Error loading transactions: %s", e)
         return {}
 
 def _save_transactions(transactions: Dict[str, Dict[str, Any]]) -> bool:
@@ -36,7 +43,7 @@ def _save_transactions(transactions: Dict[str, Dict[str, Any]]) -> bool:
             json.dump(transactions, f, default=_json_serializer, indent=2)
         return True
     except Exception as e:
-        logger.error(f"Error saving transactions: {e}")
+        logger.error("Error saving transactions: %s", e)
         return False
 
 def _json_serializer(obj):
@@ -195,7 +202,7 @@ def create_transaction(
     # Save updated transactions
     _save_transactions(transactions)
     
-    logger.info(f"Created transaction: {transaction.id}")
+    logger.info("Created transaction: %s", transaction.id)
     
     return transaction
 
@@ -258,13 +265,13 @@ def update_transaction_state(
         True if successful, False otherwise
     """
     if state_name not in ["request", "payment", "execution", "verification"]:
-        logger.error(f"Invalid state name: {state_name}")
+        logger.error("Invalid state name: %s", state_name)
         return False
     
     transactions = _load_transactions()
     
     if tx_id not in transactions:
-        logger.error(f"Transaction not found: {tx_id}")
+        logger.error("Transaction not found: %s", tx_id)
         return False
     
     # Get transaction
@@ -301,7 +308,7 @@ def update_transaction_details(
     transactions = _load_transactions()
     
     if tx_id not in transactions:
-        logger.error(f"Transaction not found: {tx_id}")
+        logger.error("Transaction not found: %s", tx_id)
         return False
     
     # Get transaction
@@ -338,7 +345,7 @@ def update_execution_step(
     transactions = _load_transactions()
     
     if tx_id not in transactions:
-        logger.error(f"Transaction not found: {tx_id}")
+        logger.error("Transaction not found: %s", tx_id)
         return False
     
     # Get transaction
@@ -346,11 +353,11 @@ def update_execution_step(
     
     # Check if execution_steps exists and has enough steps
     if "execution_steps" not in tx_data or not isinstance(tx_data["execution_steps"], list):
-        logger.error(f"No execution steps found for transaction: {tx_id}")
+        logger.error("No execution steps found for transaction: %s", tx_id)
         return False
     
     if step_index >= len(tx_data["execution_steps"]):
-        logger.error(f"Step index out of range: {step_index}, max: {len(tx_data['execution_steps']) - 1}")
+        logger.error("Step index out of range: %s, max: %s", step_index, len(tx_data['execution_steps']) - 1)
         return False
     
     # Update step
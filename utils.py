@@ -1,11 +1,28 @@
 """Utility functions for the OLAS MCP application."""
 import re
 import json
+import string
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from models import Tool, ExecutionStep
 
+# Keywords that select a tool, keyed by a fragment of the tool name. They match
+# anywhere in the prompt, inside words too, as in "subgraph" or "metadata"
+_TOOL_KEYWORDS = {
+    "defillama": ("defillama", "defi", "tvl", "lending rate", "apy", "interest rate"),
+    "thegraph": ("graph", "historical", "history", "protocol", "data", "metrics"),
+    "spaceandtime": ("space", "time", "risk", "analysis", "quantitative", "assessment"),
+    "chainlink": ("price", "oracle", "feed", "token", "valuation")
+}
+# One alternation per tool, so its keywords are found in a single pass
+_TOOL_PATTERNS = {
+    prefix: re.compile("|".join(map(re.escape, keywords)))
+    for prefix, keywords in _TOOL_KEYWORDS.items()
+}
+# Turns punctuation into spaces in a single pass
+_PUNCT_TABLE = str.maketrans({p: " " for p in string.punctuation})
+
 def parse_apy(text: str) -> Optional[float]:
     """Extract APY percentage from text."""
     # Look for percentage patterns like 4.5% or 4,5%
@@ -30,18 +47,13 @@ def infer_tools(prompt: str, available_tools: List[Dict[str, Any]]) -> List[Dict
     Returns:
         List of tool dictionaries to be used
     """
-    prompt = prompt.lower()
+    # Normalize the prompt once, each tool's keywords are then found in a
+    # single regex pass
+    prompt = prompt.lower().translate(_PUNCT_TABLE)
     selected_tools = []
     
-    tool_keywords = {
-        "defillama": ["defillama", "defi", "tvl", "lending rate", "apy", "interest rate"],
-        "thegraph": ["graph", "historical", "history", "protocol", "data", "metrics"],
-        "spaceandtime": ["space", "time", "risk", "analysis", "quantitative", "assessment"],
-        "chainlink": ["price", "oracle", "feed", "token", "valuation"]
-    }
-    
     for tool in available_tools:
-        tool_name = tool.get("name", "").lower()
+        tool_name = tool.get("name", "").lower().translate(_PUNCT_TABLE)
         # Skip tools that aren't available
         if not tool.get("available", True):
             continue
@@ -52,18 +64,17 @@ def infer_tools(prompt: str, available_tools: List[Dict[str, Any]]) -> List[Dict
             continue
             
         # Check for keywords associated with the tool
-        for keyword_prefix, keywords in tool_keywords.items():
+        for keyword_prefix, keyword_pattern in _TOOL_PATTERNS.items():
             if keyword_prefix in tool_name:
-                if any(keyword in prompt for keyword in keywords):
+                if keyword_pattern.search(prompt):
                     selected_tools.append(tool)
                     break
     
     # If no tools were matched, select the first available tool as a fallback
     if not selected_tools:
-        for tool in available_tools:
-            if tool.get("available", True):
-                selected_tools.append(tool)
-                break
+        fallback = next((tool for tool in available_tools if tool.get("available", True)), None)
+        if fallback is not None:
+            selected_tools.append(fallback)
     
     return selected_tools
 
@@ -77,16 +88,19 @@ def create_execution_steps(selected_tools: List[Tool]) -> List[Dict[str, Any]]:
     Returns:
         List of execution step dictionaries
     """
-    steps = []
+    # All steps are created at the same moment, format the time once
+    timestamp = datetime.now().isoformat()
     
     # Create a step for each tool
-    for i, tool in enumerate(selected_tools):
-        steps.append({
-            "step": f"Step {i+1}: {tool.name}",
+    steps = [
+        {
+            "step": f"Step {i}: {tool.name}",
             "tool": tool.name,
             "status": "pending",
-            "timestamp": datetime.now().isoformat()
-        })
+            "timestamp": timestamp
+        }
+        for i, tool in enumerate(selected_tools, 1)
+    ]
     
     # Add a final step for combining results if multiple tools
     if len(selected_tools) > 1:
@@ -94,7 +108,7 @@ def create_execution_steps(selected_tools: List[Tool]) -> List[Dict[str, Any]]:
             "step": f"Final Step: Combine Results",
             "tool": "Aggregator",
             "status": "pending",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": timestamp
         })
     
     return steps
\ No newline at end of file